@@ -0,0 +1,41 @@
+import gc
+import statistics
+import time
+from typing import Callable, Dict
+
+import click
+
+
+def measure(
+    func: Callable[[], object], number: int = 1000, repeat: int = 5
+) -> Dict[str, float]:
+    for _ in range(min(number, 100)):
+        func()
+
+    timings = []
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            for _ in range(number):
+                func()
+            timings.append((time.perf_counter() - started) / number)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    best = min(timings)
+    return {
+        "best_us": best * 1e6,
+        "median_us": statistics.median(timings) * 1e6,
+        "ops_per_sec": 1 / best,
+    }
+
+
+def report(name: str, result: Dict[str, float]) -> None:
+    click.echo(
+        f"{name:<40} {result['best_us']:>10.1f} us "
+        f"{result['median_us']:>10.1f} us "
+        f"{result['ops_per_sec']:>12.0f} ops/s"
+    )
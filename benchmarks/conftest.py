@@ -0,0 +1,67 @@
+import json
+import platform
+import subprocess
+from datetime import datetime
+
+import pytest  # type: ignore
+
+from tests.conftest import app, config  # noqa: F401
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("load")
+    group.addoption(
+        "--load-concurrency",
+        type=int,
+        default=16,
+        help="Number of concurrent clients for every scenario",
+    )
+    group.addoption(
+        "--load-requests",
+        type=int,
+        default=1000,
+        help="Number of requests sent in every scenario",
+    )
+    group.addoption(
+        "--load-output",
+        default="load-results.json",
+        help="Path of the JSON file with load results",
+    )
+
+
+def current_commit() -> str:
+    try:
+        output = subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+    return output.decode("utf-8").strip()
+
+
+@pytest.fixture(scope="session")
+def load_options(request):
+    return {
+        "concurrency": request.config.getoption("--load-concurrency"),
+        "total": request.config.getoption("--load-requests"),
+    }
+
+
+@pytest.fixture(scope="session")
+def load_results(request):
+    scenarios = {}
+
+    yield scenarios
+
+    with open(request.config.getoption("--load-output"), "w") as fp:
+        json.dump(
+            {
+                "commit": current_commit(),
+                "python": platform.python_version(),
+                "created_on": datetime.utcnow().isoformat(),
+                "scenarios": scenarios,
+            },
+            fp,
+            indent=2,
+        )
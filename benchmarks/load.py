@@ -0,0 +1,129 @@
+"""Drive the application with concurrent requests and summarize latency.
+
+Scenarios live in ``benchmarks/test_load.py`` and are run with
+``make load-test``. Saved results are compared with
+``python -m benchmarks.load compare baseline.json current.json``.
+"""
+import argparse
+import asyncio
+import json
+import math
+import time
+from typing import Awaitable, Callable, Dict, List
+
+import click
+
+
+def percentile(samples: List[float], value: float) -> float:
+    if not samples:
+        return 0.0
+
+    ordered = sorted(samples)
+    rank = math.ceil(value / 100 * len(ordered))
+    return ordered[min(max(rank, 1), len(ordered)) - 1]
+
+
+class LoopLagMonitor:
+    def __init__(self, interval: float = 0.01) -> None:
+        self._interval = interval
+        self._task = None
+        self.samples: List[float] = []
+
+    async def _watch(self) -> None:
+        loop = asyncio.get_event_loop()
+
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self._interval)
+            lag = loop.time() - started - self._interval
+            self.samples.append(max(lag, 0.0))
+
+    def start(self) -> None:
+        self._task = asyncio.ensure_future(self._watch())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+
+async def run_load(
+    request: Callable[[int], Awaitable[int]], concurrency: int, total: int
+) -> Dict[str, float]:
+    latencies: List[float] = []
+    errors = 0
+    remaining = total
+
+    async def worker(index: int) -> None:
+        nonlocal errors, remaining
+
+        while remaining > 0:
+            remaining -= 1
+
+            started = time.perf_counter()
+            status = await request(index)
+            latencies.append(time.perf_counter() - started)
+
+            if status >= 400:
+                errors += 1
+
+    monitor = LoopLagMonitor()
+    monitor.start()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(index) for index in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    await monitor.stop()
+
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "concurrency": concurrency,
+        "rps": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "max_ms": max(latencies, default=0.0) * 1000,
+        "loop_lag_p99_ms": percentile(monitor.samples, 99) * 1000,
+        "loop_lag_max_ms": max(monitor.samples, default=0.0) * 1000,
+    }
+
+
+def compare(baseline_path: str, current_path: str) -> None:
+    with open(baseline_path) as fp:
+        baseline = json.load(fp)["scenarios"]
+
+    with open(current_path) as fp:
+        current = json.load(fp)["scenarios"]
+
+    for name in sorted(set(baseline) & set(current)):
+        for metric in ("rps", "p50_ms", "p99_ms", "loop_lag_p99_ms"):
+            before = baseline[name][metric]
+            after = current[name][metric]
+            change = (after - before) / before * 100 if before else 0.0
+
+            click.echo(
+                f"{name:<12} {metric:<16} {before:>10.2f} "
+                f"{after:>10.2f} {change:>+8.1f}%"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    compare_parser = subparsers.add_parser("compare")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+
+    args = parser.parse_args()
+
+    if args.command == "compare":
+        compare(args.baseline, args.current)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Measure password hashing and verification cost per round count.
+
+Run with ``python -m benchmarks.passwords``.
+"""
+import argparse
+from functools import partial
+
+from benchmarks import measure, report
+from passport.domain import hash_password, User, verify_password
+
+
+PASSWORD = "top-secret"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--number", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--rounds", action="append", type=int, default=[])
+    args = parser.parse_args()
+
+    for rounds in args.rounds or (1000, 10000, 50000, 100000):
+        password_hash = hash_password(PASSWORD, rounds=rounds)
+
+        report(
+            f"hash_password rounds={rounds}",
+            measure(
+                partial(hash_password, PASSWORD, rounds=rounds),
+                number=args.number,
+                repeat=args.repeat,
+            ),
+        )
+        report(
+            f"verify_password rounds={rounds}",
+            measure(
+                partial(verify_password, PASSWORD, password_hash),
+                number=args.number,
+                repeat=args.repeat,
+            ),
+        )
+
+    user = User(key=42, email="john@testing.com")  # type: ignore
+    user.set_password(PASSWORD)
+
+    report(
+        "User.set_password",
+        measure(
+            lambda: user.set_password(PASSWORD),
+            number=args.number,
+            repeat=args.repeat,
+        ),
+    )
+    report(
+        "User.verify_password",
+        measure(
+            lambda: user.verify_password(PASSWORD),
+            number=args.number,
+            repeat=args.repeat,
+        ),
+    )
+
+
+if __name__ == "__main__":
+    main()
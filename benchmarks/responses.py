@@ -0,0 +1,55 @@
+"""Compare the cost of rendering a user payload into a JSON response.
+
+Run with ``python -m benchmarks.responses``.
+"""
+import argparse
+import json
+
+from benchmarks import measure, report
+from passport.domain import Permission, User
+from passport.handlers import (
+    dumps,
+    json_response,
+    user_response_schema,
+    UserResponseSchema,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--number", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    user = User(  # type: ignore
+        key=42,
+        email="john@testing.com",
+        permissions=[Permission(key=1, name="read")],  # type: ignore
+    )
+
+    def baseline():
+        schema = UserResponseSchema()
+        return json.dumps(schema.dump({"user": user}))
+
+    candidates = (
+        ("schema per request + json", baseline),
+        (
+            "shared schema + json",
+            lambda: json.dumps(user_response_schema.dump({"user": user})),
+        ),
+        (
+            "shared schema + dumps",
+            lambda: dumps(user_response_schema.dump({"user": user})),
+        ),
+        (
+            "shared schema + json_response",
+            lambda: json_response(user_response_schema.dump({"user": user})),
+        ),
+    )
+
+    for name, func in candidates:
+        report(name, measure(func, number=args.number, repeat=args.repeat))
+
+
+if __name__ == "__main__":
+    main()
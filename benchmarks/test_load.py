@@ -0,0 +1,144 @@
+from typing import Dict, List
+
+import pytest  # type: ignore
+
+from benchmarks.load import run_load
+
+
+PASSWORD = "top-secret"
+
+
+async def register_users(client, count: int) -> List[Dict[str, str]]:
+    url = client.app.router.named_resources()["api.users.register"].url_for()
+
+    users = []
+    for index in range(count):
+        credentials = {
+            "email": f"user-{index}@testing.com",
+            "password": PASSWORD,
+        }
+        resp = await client.post(url, json=credentials)
+        assert resp.status == 201
+        users.append(credentials)
+
+    return users
+
+
+async def login_users(client, users: List[Dict[str, str]]) -> List[Dict]:
+    url = client.app.router.named_resources()["api.users.login"].url_for()
+
+    tokens = []
+    for credentials in users:
+        resp = await client.post(url, json=credentials)
+        assert resp.status == 200
+        tokens.append(
+            {
+                "access": resp.headers["X-ACCESS-TOKEN"],
+                "refresh": resp.headers["X-REFRESH-TOKEN"],
+            }
+        )
+
+    return tokens
+
+
+async def login_sessions(client, users: List[Dict[str, str]]) -> List[str]:
+    url = client.app.router.named_resources()["auth.login"].url_for()
+    cookie = client.app["config"].sessions.cookie
+
+    sessions = []
+    for credentials in users:
+        resp = await client.post(url, json=credentials)
+        assert resp.status == 200
+        sessions.append(resp.cookies[cookie].value)
+
+    client.session.cookie_jar.clear()
+
+    return sessions
+
+
+@pytest.mark.load
+async def test_login(aiohttp_client, app, load_options, load_results):
+    client = await aiohttp_client(app)
+    users = await register_users(client, load_options["concurrency"])
+    url = app.router.named_resources()["api.users.login"].url_for()
+
+    async def request(worker: int) -> int:
+        async with client.post(url, json=users[worker]) as resp:
+            await resp.read()
+            return resp.status
+
+    load_results["login"] = await run_load(request, **load_options)
+    assert load_results["login"]["errors"] == 0
+
+
+@pytest.mark.load
+async def test_register(aiohttp_client, app, load_options, load_results):
+    client = await aiohttp_client(app)
+    url = app.router.named_resources()["api.users.register"].url_for()
+    counter = iter(range(load_options["total"]))
+
+    async def request(worker: int) -> int:
+        email = f"new-{next(counter)}@testing.com"
+        async with client.post(
+            url, json={"email": email, "password": PASSWORD}
+        ) as resp:
+            await resp.read()
+            return resp.status
+
+    load_results["register"] = await run_load(request, **load_options)
+    assert load_results["register"]["errors"] == 0
+
+
+@pytest.mark.load
+async def test_access(aiohttp_client, app, load_options, load_results):
+    client = await aiohttp_client(app)
+    users = await register_users(client, load_options["concurrency"])
+    sessions = await login_sessions(client, users)
+    url = app.router.named_resources()["api.tokens.access"].url_for()
+    cookie = app["config"].sessions.cookie
+
+    async def request(worker: int) -> int:
+        headers = {"Cookie": f"{cookie}={sessions[worker]}"}
+        async with client.get(url, headers=headers) as resp:
+            await resp.read()
+            return resp.status
+
+    load_results["access"] = await run_load(request, **load_options)
+    assert load_results["access"]["errors"] == 0
+
+
+@pytest.mark.load
+async def test_refresh(aiohttp_client, app, load_options, load_results):
+    client = await aiohttp_client(app)
+    users = await register_users(client, load_options["concurrency"])
+    tokens = await login_users(client, users)
+    url = app.router.named_resources()["api.tokens.refresh"].url_for()
+
+    async def request(worker: int) -> int:
+        headers = {"X-REFRESH-TOKEN": tokens[worker]["refresh"]}
+        async with client.post(url, headers=headers) as resp:
+            await resp.read()
+            # Refresh tokens are rotated, every worker follows its chain.
+            if resp.status == 200:
+                tokens[worker]["refresh"] = resp.headers["X-REFRESH-TOKEN"]
+            return resp.status
+
+    load_results["refresh"] = await run_load(request, **load_options)
+    assert load_results["refresh"]["errors"] == 0
+
+
+@pytest.mark.load
+async def test_profile(aiohttp_client, app, load_options, load_results):
+    client = await aiohttp_client(app)
+    users = await register_users(client, load_options["concurrency"])
+    tokens = await login_users(client, users)
+    url = app.router.named_resources()["api.users.profile"].url_for()
+
+    async def request(worker: int) -> int:
+        headers = {"X-ACCESS-TOKEN": tokens[worker]["access"]}
+        async with client.get(url, headers=headers) as resp:
+            await resp.read()
+            return resp.status
+
+    load_results["profile"] = await run_load(request, **load_options)
+    assert load_results["profile"]["errors"] == 0
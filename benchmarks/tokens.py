@@ -0,0 +1,118 @@
+"""Compare token signing and verification throughput per algorithm.
+
+Run with ``python -m benchmarks.tokens``.
+"""
+import argparse
+from typing import Callable, Optional, Type
+
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+
+from benchmarks import measure, report
+from passport.cache import TTLCache
+from passport.domain import Permission, User
+from passport.exceptions import BadToken, TokenExpired
+from passport.services.tokens import (
+    CachedTokenDecoder,
+    TokenDecoder,
+    TokenGenerator,
+)
+
+
+ALGORITHMS = ("RS256", "ES256", "EdDSA")
+
+
+def generate_key(algorithm: str, key_size: int = 2048):
+    if algorithm == "RS256":
+        return rsa.generate_private_key(65537, key_size, default_backend())
+    elif algorithm == "ES256":
+        return ec.generate_private_key(ec.SECP256R1(), default_backend())
+
+    return ed25519.Ed25519PrivateKey.generate()
+
+
+def expect(
+    func: Callable[[], object], exc: Type[Exception]
+) -> Callable[[], None]:
+    def wrapped() -> None:
+        try:
+            func()
+        except exc:
+            pass
+        else:
+            raise AssertionError(f"{exc.__name__} expected")
+
+    return wrapped
+
+
+def bench_algorithm(
+    algorithm: str,
+    user: User,
+    number: int,
+    repeat: int,
+    key_size: Optional[int] = None,
+):
+    name = f"{algorithm}/{key_size}" if key_size else algorithm
+
+    private_key = generate_key(algorithm, key_size or 2048)
+    generator = TokenGenerator(private_key, algorithm=algorithm)
+    decoder = TokenDecoder(private_key.public_key())
+    cached = CachedTokenDecoder(decoder, TTLCache(maxsize=16, ttl=900))
+
+    token = generator.generate(user, expire=900)
+    expired = generator.generate(user, expire=-60)
+
+    # Keeps the header and payload of a valid token, so the decoder finds
+    # the key and fails on the signature check itself.
+    other = TokenGenerator(generate_key(algorithm, key_size or 2048))
+    signature = other.generate(user, expire=900).rsplit(".", 1)[1]
+    forged = "{}.{}".format(token.rsplit(".", 1)[0], signature)
+
+    cases = (
+        ("sign", lambda: generator.generate(user, expire=900)),
+        ("verify", lambda: decoder.decode(token)),
+        (
+            "verify expired",
+            expect(lambda: decoder.decode(expired), TokenExpired),
+        ),
+        (
+            "verify bad signature",
+            expect(lambda: decoder.decode(forged), BadToken),
+        ),
+        ("verify cached", lambda: cached.decode(token)),
+    )
+
+    for case, func in cases:
+        report(f"{name} {case}", measure(func, number=number, repeat=repeat))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--number", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--algorithm", action="append", choices=ALGORITHMS, default=[]
+    )
+    parser.add_argument(
+        "--rsa-key-size", action="append", type=int, default=[]
+    )
+    args = parser.parse_args()
+
+    user = User(  # type: ignore
+        key=42,
+        email="john@testing.com",
+        permissions=[Permission(key=1, name="read")],  # type: ignore
+    )
+
+    for algorithm in args.algorithm or ALGORITHMS:
+        if algorithm == "RS256":
+            for key_size in args.rsa_key_size or (2048, 3072, 4096):
+                bench_algorithm(
+                    algorithm, user, args.number, args.repeat, key_size
+                )
+        else:
+            bench_algorithm(algorithm, user, args.number, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
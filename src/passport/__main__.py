@@ -12,6 +12,8 @@ from config import (  # type: ignore
 )
 
 from passport.app import AppConfig, init
+from passport.management.permissions import permissions
+from passport.management.users import users
 
 
 @click.group()
@@ -59,6 +61,8 @@ def cli(ctx, conf_dir: str = None, debug: bool = False) -> None:
 
 cli.add_command(server, name="server")
 cli.add_command(storage, name="storage")
+cli.add_command(permissions, name="permissions")
+cli.add_command(users, name="users")
 
 
 if __name__ == "__main__":
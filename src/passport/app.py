@@ -13,18 +13,43 @@ from aiohttp_storage import (  # type: ignore
     StorageConfig,
 )
 
-from passport.handlers import auth as auth_endpoints
+from passport.cache import MemoryCacheBackend, TTLCache
+from passport.handlers import auth as auth_endpoints, PreparedResponse
 from passport.handlers.api import (
-    keys,
+    keys as key_endpoints,
     tokens as token_endpoints,
     users as user_endpoints,
 )
+from passport.monitor import blocking_middleware, monitor_ctx
+from passport.services.keys import KeySet, load_public_keys
+from passport.services.passwords import passwords_ctx
+from passport.services.revocation import revocation_ctx
+from passport.services.sessions import reaper_ctx
+from passport.services.tokens import (
+    CachedTokenDecoder,
+    TokenDecoder,
+    TokenGenerator,
+)
+from passport.services.users import inactive_users_ctx, last_login_ctx
+from passport.storage.instrumentation import (
+    instrumentation_ctx,
+    queries_middleware,
+)
+from passport.timing import server_timing_middleware
 
 
 class SessionConfig(config.Config):
     domain = config.StrField(env="SESSION_DOMAIN")
     cookie = config.StrField(default="session", env="SESSION_COOKIE")
     expire = config.IntField(default=30, env="SESSION_EXPIRE")
+    cache_size = config.IntField(default=10000, env="SESSION_CACHE_SIZE")
+    cache_ttl = config.IntField(default=60, env="SESSION_CACHE_TTL")
+    reaper_interval = config.IntField(
+        default=300, env="SESSION_REAPER_INTERVAL"
+    )
+    reaper_batch_size = config.IntField(
+        default=1000, env="SESSION_REAPER_BATCH_SIZE"
+    )
 
 
 class TokenConfig(config.Config):
@@ -38,12 +63,75 @@ class TokenConfig(config.Config):
     public_key = config.StrField(
         path="passport.key.pub", env="TOKEN_PUBLIC_KEY"
     )
+    extra_public_keys = config.StrField(
+        default="", env="TOKEN_EXTRA_PUBLIC_KEYS"
+    )
+    keys_max_age = config.IntField(default=300, env="TOKEN_KEYS_MAX_AGE")
+    algorithm = config.StrField(default="RS256", env="TOKEN_ALGORITHM")
+    accepted_algorithms = config.StrField(
+        default="RS256,ES256,EdDSA", env="TOKEN_ACCEPTED_ALGORITHMS"
+    )
+    revocation_sync_interval = config.IntField(
+        default=5, env="TOKEN_REVOCATION_SYNC_INTERVAL"
+    )
+    revocation_batch_size = config.IntField(
+        default=1000, env="TOKEN_REVOCATION_BATCH_SIZE"
+    )
+    introspection_cache_size = config.IntField(
+        default=100000, env="TOKEN_INTROSPECTION_CACHE_SIZE"
+    )
+    introspection_cache_ttl = config.IntField(
+        default=900, env="TOKEN_INTROSPECTION_CACHE_TTL"
+    )
+
+
+class PasswordsConfig(config.Config):
+    executor = config.StrField(default="thread", env="PASSWORDS_EXECUTOR")
+    workers = config.IntField(default=4, env="PASSWORDS_WORKERS")
+    max_pending = config.IntField(default=64, env="PASSWORDS_MAX_PENDING")
+    retry_after = config.IntField(default=1, env="PASSWORDS_RETRY_AFTER")
+    rounds = config.IntField(default=10000, env="PASSWORDS_ROUNDS")
+
+
+class UsersConfig(config.Config):
+    last_login_buffer_size = config.IntField(
+        default=1000, env="USERS_LAST_LOGIN_BUFFER_SIZE"
+    )
+    last_login_flush_interval = config.IntField(
+        default=10, env="USERS_LAST_LOGIN_FLUSH_INTERVAL"
+    )
+    inactive_reload_interval = config.IntField(
+        default=30, env="USERS_INACTIVE_RELOAD_INTERVAL"
+    )
+    refresh_claims_max_age = config.IntField(
+        default=3600, env="USERS_REFRESH_CLAIMS_MAX_AGE"
+    )
+    refresh_force_fetch = config.BoolField(
+        default=False, env="USERS_REFRESH_FORCE_FETCH"
+    )
+
+
+class MonitorConfig(config.Config):
+    lag_interval = config.IntField(default=500, env="MONITOR_LAG_INTERVAL")
+    lag_threshold = config.IntField(default=100, env="MONITOR_LAG_THRESHOLD")
+    slow_callback_threshold = config.IntField(
+        default=50, env="MONITOR_SLOW_CALLBACK_THRESHOLD"
+    )
+    server_timing = config.BoolField(
+        default=False, env="MONITOR_SERVER_TIMING"
+    )
+    slow_query_threshold = config.IntField(
+        default=100, env="MONITOR_SLOW_QUERY_THRESHOLD"
+    )
 
 
 class AppConfig(BaseConfig):
     db = config.NestedField[StorageConfig](StorageConfig)
+    monitor = config.NestedField[MonitorConfig](MonitorConfig)
+    passwords = config.NestedField[PasswordsConfig](PasswordsConfig)
     sessions = config.NestedField[SessionConfig](SessionConfig)
     tokens = config.NestedField[TokenConfig](TokenConfig)
+    users = config.NestedField[UsersConfig](UsersConfig)
 
 
 def init(app_name: str, config: AppConfig) -> web.Application:
@@ -59,13 +147,64 @@ def init(app_name: str, config: AppConfig) -> web.Application:
         config=app["config"].db,
     )
 
+    app.middlewares.append(server_timing_middleware)
+    app.middlewares.append(queries_middleware)
+    app.middlewares.append(blocking_middleware)
+
+    app.cleanup_ctx.append(instrumentation_ctx)
+    app.cleanup_ctx.append(monitor_ctx)
+    app.cleanup_ctx.append(passwords_ctx)
+    app.cleanup_ctx.append(reaper_ctx)
+    app.cleanup_ctx.append(last_login_ctx)
+    app.cleanup_ctx.append(revocation_ctx)
+    app.cleanup_ctx.append(inactive_users_ctx)
+
+    app["sessions_cache"] = MemoryCacheBackend(
+        maxsize=app["config"].sessions.cache_size,
+        ttl=app["config"].sessions.cache_ttl,
+    )
+
+    tokens_config = app["config"].tokens
+
+    app["token_generator"] = TokenGenerator(
+        private_key=tokens_config.private_key,
+        algorithm=tokens_config.algorithm,
+    )
+    app["token_decoder"] = TokenDecoder(
+        public_key=tokens_config.public_key,
+        extra_keys=load_public_keys(tokens_config.extra_public_keys or ""),
+        algorithms=[
+            algorithm.strip()
+            for algorithm in tokens_config.accepted_algorithms.split(",")
+        ],
+    )
+    app["introspection_decoder"] = CachedTokenDecoder(
+        app["token_decoder"],
+        cache=TTLCache(
+            maxsize=tokens_config.introspection_cache_size,
+            ttl=tokens_config.introspection_cache_ttl,
+        ),
+    )
+
+    key_set = KeySet(app["token_decoder"].keys.values())
+    app["jwks_response"] = PreparedResponse(
+        key_set.jwks(), max_age=tokens_config.keys_max_age
+    )
+    app["keys_response"] = PreparedResponse(
+        {"public": tokens_config.public_key},
+        max_age=tokens_config.keys_max_age,
+    )
+
     # Public user endpoints
     app.router.add_post("/auth/login", auth_endpoints.login, name="auth.login")
     app.router.add_post(
         "/auth/logout", auth_endpoints.logout, name="auth.logout"
     )
 
-    app.router.add_get("/api/keys", keys, name="api.keys")
+    app.router.add_get("/api/keys", key_endpoints.public, name="api.keys")
+    app.router.add_get(
+        "/.well-known/jwks.json", key_endpoints.jwks, name="api.jwks"
+    )
 
     # User API endpoints
     app.router.add_get(
@@ -87,6 +226,11 @@ def init(app_name: str, config: AppConfig) -> web.Application:
         token_endpoints.refresh,
         name="api.tokens.refresh",
     )
+    app.router.add_post(
+        "/api/tokens/introspect",
+        token_endpoints.introspect,
+        name="api.tokens.introspect",
+    )
 
     setup_openapi(
         app,
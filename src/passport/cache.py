@@ -0,0 +1,81 @@
+import time
+from collections import OrderedDict
+from typing import Generic, Hashable, Optional, Protocol, Tuple, TypeVar
+
+
+V = TypeVar("V")
+
+
+class TTLCache(Generic[V]):
+    __slots__ = ("_entries", "_maxsize", "_ttl", "hits", "misses")
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self._entries: "OrderedDict[Hashable, Tuple[V, float]]" = OrderedDict()
+        self._maxsize = maxsize
+        self._ttl = ttl
+
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[V]:
+        entry = self._entries.get(key, None)
+
+        if entry is not None:
+            value, expires = entry
+
+            if expires > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+
+            del self._entries[key]
+
+        self.misses += 1
+        return None
+
+    def set(self, key: Hashable, value: V, ttl: float = None) -> None:
+        if ttl is None or ttl > self._ttl:
+            ttl = self._ttl
+
+        if self._maxsize <= 0 or ttl <= 0:
+            return
+
+        self._entries[key] = (value, time.monotonic() + ttl)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class CacheBackend(Protocol[V]):
+    async def get(self, key: str) -> Optional[V]:
+        ...
+
+    async def set(self, key: str, value: V, ttl: float = None) -> None:
+        ...
+
+    async def delete(self, key: str) -> None:
+        ...
+
+
+class MemoryCacheBackend(CacheBackend[V]):
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.cache: TTLCache[V] = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    async def get(self, key: str) -> Optional[V]:
+        return self.cache.get(key)
+
+    async def set(self, key: str, value: V, ttl: float = None) -> None:
+        self.cache.set(key, value, ttl=ttl)
+
+    async def delete(self, key: str) -> None:
+        self.cache.delete(key)
@@ -1,17 +1,130 @@
+import asyncio
 import functools
-from typing import AsyncGenerator
+import time
+from contextlib import suppress
+from typing import Any, AsyncGenerator, Optional
 
-from aiohttp import ClientSession, web
-from config import Config, StrField  # type: ignore
+from aiohttp import ClientSession, TCPConnector, web
+from config import Config, IntField, StrField  # type: ignore
 
-from passport.domain import User
-from passport.exceptions import BadToken, TokenExpired
-from passport.services.tokens import TokenDecoder
+from passport.cache import TTLCache
+from passport.domain import TokenType, User
+from passport.exceptions import BadToken, TokenExpired, UnknownKey
+from passport.services.keys import from_jwk
+from passport.services.tokens import CachedTokenDecoder, TokenDecoder
 
 
 class PassportConfig(Config):
     host = StrField(env="PASSPORT_HOST")
-    public_key = StrField()
+    token_cache_size = IntField(default=10000, env="PASSPORT_TOKEN_CACHE_SIZE")
+    token_cache_ttl = IntField(default=900, env="PASSPORT_TOKEN_CACHE_TTL")
+    keys_refresh_interval = IntField(
+        default=300, env="PASSPORT_KEYS_REFRESH_INTERVAL"
+    )
+    keys_refetch_interval = IntField(
+        default=30, env="PASSPORT_KEYS_REFETCH_INTERVAL"
+    )
+
+
+class KeyManager:
+    def __init__(
+        self,
+        session: ClientSession,
+        url: str,
+        cache: TTLCache[User],
+        refetch_interval: float,
+        logger: Any,
+        verify_ssl: bool = True,
+    ) -> None:
+        self._session = session
+        self._url = url
+        self._cache = cache
+        self._refetch_interval = refetch_interval
+        self._logger = logger
+        self._verify_ssl = verify_ssl
+
+        self._decoder: Optional[CachedTokenDecoder] = None
+        self._etag: Optional[str] = None
+        self._fetched_at = 0.0
+        self._refetch: Optional[asyncio.Future] = None
+
+    async def fetch(self) -> bool:
+        headers = {}
+        if self._etag:
+            headers["If-None-Match"] = self._etag
+
+        self._fetched_at = time.monotonic()
+
+        async with self._session.get(
+            self._url, headers=headers, ssl=self._verify_ssl
+        ) as resp:
+            if resp.status == 304:
+                return False
+
+            if resp.status != 200:
+                self._logger.error(
+                    "Fetch passport keys failed", status=resp.status
+                )
+                raise RuntimeError("Could not fetch passport keys")
+
+            jwks = await resp.json()
+            self._etag = resp.headers.get("ETag", None)
+
+        keys = [from_jwk(jwk) for jwk in jwks["keys"]]
+        if not keys:
+            raise RuntimeError("Passport returned no keys")
+
+        self._cache.clear()
+        self._decoder = CachedTokenDecoder(
+            TokenDecoder(public_key=keys[0], extra_keys=keys[1:]),
+            cache=self._cache,
+        )
+
+        self._logger.info("Passport keys updated", keys=len(keys))
+
+        return True
+
+    async def refresh(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+
+            try:
+                await self.fetch()
+            except Exception:
+                self._logger.exception("Refresh passport keys failed")
+
+    def request_refetch(self) -> None:
+        if self._refetch is not None and not self._refetch.done():
+            return
+
+        if time.monotonic() - self._fetched_at < self._refetch_interval:
+            return
+
+        self._refetch = asyncio.ensure_future(self._safe_fetch())
+
+    async def _safe_fetch(self) -> None:
+        try:
+            await self.fetch()
+        except Exception:
+            self._logger.exception("Refetch passport keys failed")
+
+    async def close(self) -> None:
+        if self._refetch is not None:
+            self._refetch.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._refetch
+
+    def decode(
+        self, token: str, token_type: TokenType = TokenType.access
+    ) -> User:
+        if self._decoder is None:
+            raise BadToken()
+
+        try:
+            return self._decoder.decode(token, token_type)
+        except UnknownKey:
+            self.request_refetch()
+            raise
 
 
 def user_required(header: str = "X-ACCESS-TOKEN"):
@@ -24,9 +137,7 @@ def user_required(header: str = "X-ACCESS-TOKEN"):
                 raise web.HTTPUnauthorized(text="Auth token required")
 
             try:
-                config = request.app["config"]
-                decoder = TokenDecoder(public_key=config.passport.public_key)
-                user: User = decoder.decode(token)
+                user: User = request.app["passport_keys"].decode(token)
             except (BadToken, TokenExpired):
                 raise web.HTTPForbidden
 
@@ -52,22 +163,43 @@ async def passport_ctx(app: web.Application) -> AsyncGenerator[None, None]:
     if app["config"].debug:
         verify_ssl = False
 
-    url = f"{config.passport.host}/api/keys"
+    url = f"{config.passport.host}/.well-known/jwks.json"
 
-    async with ClientSession() as session:
-        async with session.get(url, ssl=verify_ssl) as resp:
-            if resp.status != 200:
-                app["logger"].error(
-                    "Fetch passport keys failed", status=resp.status
-                )
-                raise RuntimeError("Could not fetch passport keys")
+    session = ClientSession(connector=TCPConnector(limit=4))
+
+    manager = KeyManager(
+        session,
+        url,
+        cache=TTLCache(
+            maxsize=config.passport.token_cache_size,
+            ttl=config.passport.token_cache_ttl,
+        ),
+        refetch_interval=config.passport.keys_refetch_interval,
+        logger=app["logger"],
+        verify_ssl=verify_ssl,
+    )
 
-            keys = await resp.json()
+    try:
+        await manager.fetch()
+    except Exception:
+        await session.close()
+        raise
 
-            config.passport.public_key = keys["public"]
+    app["passport_keys"] = manager
+
+    task = asyncio.ensure_future(
+        manager.refresh(config.passport.keys_refresh_interval)
+    )
 
     yield
 
+    task.cancel()
+    with suppress(asyncio.CancelledError):
+        await task
+
+    await manager.close()
+    await session.close()
+
 
 def setup(app: web.Application) -> None:
     app.cleanup_ctx.append(passport_ctx)
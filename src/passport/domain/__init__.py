@@ -1,4 +1,5 @@
 from dataclasses import dataclass, field
+from datetime import datetime
 from enum import Enum
 from typing import List, Optional
 
@@ -6,6 +7,24 @@ from aiohttp_micro.entities import Entity  # type: ignore
 from passlib.handlers.pbkdf2 import pbkdf2_sha512  # type: ignore
 
 
+PASSWORD_ROUNDS = 10000
+PASSWORD_SALT_SIZE = 10
+
+
+def hash_password(password: str, rounds: int = PASSWORD_ROUNDS) -> str:
+    return pbkdf2_sha512.encrypt(
+        password, rounds=rounds, salt_size=PASSWORD_SALT_SIZE
+    )
+
+
+def verify_password(password: str, password_hash: Optional[str]) -> bool:
+    try:
+        valid = pbkdf2_sha512.verify(password, password_hash)
+    except (TypeError, ValueError):
+        valid = False
+    return valid
+
+
 class TokenType(Enum):
     access = "access"
     refresh = "refresh"
@@ -24,13 +43,14 @@ class User(Entity):
     permissions: List[Permission] = field(default_factory=list)
 
     def set_password(self, password: str) -> None:
-        self.password = pbkdf2_sha512.encrypt(
-            password, rounds=10000, salt_size=10
-        )
+        self.password = hash_password(password)
 
     def verify_password(self, password: str) -> bool:
-        try:
-            valid = pbkdf2_sha512.verify(password, self.password)
-        except ValueError:
-            valid = False
-        return valid
+        return verify_password(password, self.password)
+
+
+@dataclass
+class Session:
+    key: str
+    user: User
+    expires: datetime
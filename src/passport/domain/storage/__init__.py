@@ -1,9 +1,11 @@
 from abc import ABC
 
 from passport.domain.storage.sessions import SessionRepo
+from passport.domain.storage.tokens import RevokedTokensRepo
 from passport.domain.storage.users import UsersRepo
 
 
 class Storage(ABC):
     sessions: SessionRepo
+    tokens: RevokedTokensRepo
     users: UsersRepo
@@ -1,15 +1,21 @@
 from datetime import datetime
 from typing import Protocol
 
-from passport.domain import User
+from passport.domain import Session, User
 
 
 class SessionRepo(Protocol):
     async def fetch(self, key: str) -> int:
         ...
 
+    async def fetch_session(self, key: str) -> Session:
+        ...
+
     async def add(self, user: User, key: str, expires: datetime) -> None:
         ...
 
     async def remove(self, key: str) -> None:
         ...
+
+    async def remove_expired(self, now: datetime, limit: int) -> int:
+        ...
@@ -0,0 +1,15 @@
+from datetime import datetime
+from typing import List, Protocol, Tuple
+
+
+class RevokedTokensRepo(Protocol):
+    async def add(self, jti: str, user_key: int, expires: datetime) -> bool:
+        ...
+
+    async def fetch_since(
+        self, key: int, limit: int
+    ) -> List[Tuple[int, str, datetime]]:
+        ...
+
+    async def remove_expired(self, now: datetime, limit: int) -> int:
+        ...
@@ -1,4 +1,5 @@
-from typing import Protocol
+from datetime import datetime
+from typing import Dict, Iterable, Protocol, Sequence, Set, Tuple
 
 from passport.domain import Permission, User
 
@@ -10,12 +11,18 @@ class UsersRepo(Protocol):
     async def fetch_by_email(self, email: str) -> User:
         ...
 
+    async def fetch_inactive_keys(self) -> Set[int]:
+        ...
+
     async def exists(self, email: str) -> bool:
         ...
 
     async def add(self, user: User) -> None:
         ...
 
+    async def add_many(self, users: Sequence[User]) -> int:
+        ...
+
     async def add_permission(self, user: User, permission: Permission) -> None:
         ...
 
@@ -24,5 +31,16 @@ class UsersRepo(Protocol):
     ) -> None:
         ...
 
+    async def update_last_login(self, logins: Dict[int, datetime]) -> None:
+        ...
+
+    async def add_permissions(self, grants: Iterable[Tuple[str, str]]) -> int:
+        ...
+
+    async def remove_permissions(
+        self, grants: Iterable[Tuple[str, str]]
+    ) -> int:
+        ...
+
     async def save_user(self, email: str, password: str) -> int:
         ...
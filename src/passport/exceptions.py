@@ -2,9 +2,17 @@ class BadToken(Exception):
     pass
 
 
+class UnknownKey(BadToken):
+    pass
+
+
 class TokenExpired(Exception):
     pass
 
 
 class Forbidden(Exception):
     pass
+
+
+class Overloaded(Exception):
+    pass
@@ -1,4 +1,7 @@
 import functools
+import hashlib
+import json
+from typing import Any, Dict
 
 from aiohttp import web
 from aiohttp_micro.exceptions import EntityNotFound  # type: ignore
@@ -8,8 +11,17 @@ from marshmallow import fields, Schema
 
 from passport.domain import User
 from passport.exceptions import BadToken, TokenExpired
-from passport.services.tokens import TokenDecoder
+from passport.services.sessions import SessionService
 from passport.storage import DBStorage
+from passport.timing import stage
+
+
+try:
+    import orjson  # type: ignore
+
+    HAS_ORJSON = True
+except ImportError:  # pragma: no cover
+    HAS_ORJSON = False
 
 
 AccessTokenParameter = Parameter(
@@ -49,6 +61,69 @@ class UserResponseSchema(Schema):
     user = fields.Nested(UserSchema, required=True)
 
 
+user_response_schema = UserResponseSchema()
+
+
+def dumps(data: Any) -> bytes:
+    if HAS_ORJSON:
+        return orjson.dumps(data)
+
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+
+def json_response(
+    data: Any, status: int = 200, headers: Dict[str, str] = None
+) -> web.Response:
+    return web.Response(
+        body=dumps(data),
+        status=status,
+        content_type="application/json",
+        headers=headers,
+    )
+
+
+class PreparedResponse:
+    __slots__ = ("body", "etag", "cache_control")
+
+    def __init__(self, data: Any, max_age: int) -> None:
+        self.body = dumps(data)
+        self.etag = '"{}"'.format(hashlib.sha256(self.body).hexdigest()[:32])
+        self.cache_control = f"public, max-age={max_age}"
+
+    def is_modified(self, request: web.Request) -> bool:
+        header = request.headers.get("If-None-Match", None)
+        if header is None:
+            return True
+
+        for etag in header.split(","):
+            etag = etag.strip()
+            if etag.startswith("W/"):
+                etag = etag[2:]
+
+            if etag in (self.etag, "*"):
+                return False
+
+        return True
+
+    def respond(self, request: web.Request) -> web.Response:
+        headers = {"ETag": self.etag, "Cache-Control": self.cache_control}
+
+        if not self.is_modified(request):
+            return web.Response(status=304, headers=headers)
+
+        return web.Response(
+            body=self.body, content_type="application/json", headers=headers
+        )
+
+
+def service_unavailable(request: web.Request) -> web.HTTPServiceUnavailable:
+    retry_after = request.app["config"].passwords.retry_after
+
+    return web.HTTPServiceUnavailable(
+        headers={"Retry-After": str(retry_after)}
+    )
+
+
 def token_required(header: str = "X-ACCESS-TOKEN"):
     def wrapper(f):
         @functools.wraps(f)
@@ -59,9 +134,7 @@ def token_required(header: str = "X-ACCESS-TOKEN"):
                 raise web.HTTPUnauthorized(text="Auth token required")
 
             try:
-                config = request.app["config"]
-                decoder = TokenDecoder(public_key=config.tokens.public_key)
-                user = decoder.decode(token)
+                user = request.app["token_decoder"].decode(token)
             except (BadToken, TokenExpired):
                 raise web.HTTPForbidden
 
@@ -82,18 +155,17 @@ def session_required(f):
         session_key = request.cookies.get(config.sessions.cookie, None)
         if session_key:
             storage = DBStorage(request.app["db"])
+            service = SessionService(storage, request.app["sessions_cache"])
 
-            user_key = await storage.sessions.fetch(key=session_key)
-
-            if user_key:
-                try:
-                    user = await storage.users.fetch_by_key(key=user_key)
-                except EntityNotFound:
-                    raise web.HTTPForbidden
+            try:
+                with stage("sessions.fetch"):
+                    user = await service.fetch(key=session_key)
+            except EntityNotFound:
+                raise web.HTTPForbidden
 
-                request["user"] = user
+            request["user"] = user
 
-                return await f(request)
+            return await f(request)
 
         raise web.HTTPForbidden
 
@@ -0,0 +1,48 @@
+from aiohttp import web
+from aiohttp_openapi import JSONResponse, register_operation  # type: ignore
+from marshmallow import fields, Schema  # type: ignore
+
+
+class KeysResponseSchema(Schema):
+    public = fields.Str()
+
+
+class JWKSchema(Schema):
+    kid = fields.Str(description="Key ID")
+    kty = fields.Str(description="Key type")
+    use = fields.Str(description="Public key use")
+    n = fields.Str(description="RSA modulus")
+    e = fields.Str(description="RSA exponent")
+    crv = fields.Str(description="Curve")
+    x = fields.Str(description="Curve point X coordinate")
+    y = fields.Str(description="Curve point Y coordinate")
+
+
+class JWKSResponseSchema(Schema):
+    keys = fields.List(fields.Nested(JWKSchema))
+
+
+@register_operation(
+    description="Get public key for token verification",
+    responses=(
+        JSONResponse(
+            description="Public key",
+            schema=KeysResponseSchema,  # type: ignore
+        ),
+    ),
+)
+async def public(request: web.Request) -> web.Response:
+    return request.app["keys_response"].respond(request)
+
+
+@register_operation(
+    description="Get active token verification keys as JSON Web Key Set",
+    responses=(
+        JSONResponse(
+            description="JSON Web Key Set",
+            schema=JWKSResponseSchema,  # type: ignore
+        ),
+    ),
+)
+async def jwks(request: web.Request) -> web.Response:
+    return request.app["jwks_response"].respond(request)
@@ -1,21 +1,105 @@
+import hashlib
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
 from aiohttp import web
 from aiohttp_micro.exceptions import EntityNotFound  # type: ignore
-from aiohttp_micro.handlers import json_response  # type: ignore
-from aiohttp_openapi import JSONResponse, register_operation  # type: ignore
+from aiohttp_micro.handlers import validate_payload  # type: ignore
+from aiohttp_openapi import (  # type: ignore
+    JSONResponse,
+    register_operation,
+    RequestBody,
+)
+from marshmallow import fields, Schema, validate
 
-from passport.domain import TokenType
-from passport.exceptions import BadToken
+from passport.domain import TokenType, User
+from passport.exceptions import BadToken, TokenExpired, UnknownKey
 from passport.handlers import (
+    json_response,
     RefreshTokenParameter,
     session_required,
     SessionParameter,
+    user_response_schema,
     UserResponseSchema,
+    UserSchema,
 )
-from passport.services.tokens import TokenDecoder, TokenGenerator
+from passport.services.revocation import RevocationService
+from passport.services.tokens import load_user
 from passport.services.users import UserService
 from passport.storage import DBStorage
 
 
+MAX_INTROSPECTION_TOKENS = 100
+
+
+class IntrospectionPayloadSchema(Schema):
+    tokens = fields.List(
+        fields.Str(),
+        required=True,
+        validate=validate.Length(min=1, max=MAX_INTROSPECTION_TOKENS),
+        description="Access tokens",
+    )
+
+
+class IntrospectionSchema(UserResponseSchema):
+    active = fields.Bool(required=True, description="Token is valid")
+    user = fields.Nested(UserSchema)
+    error = fields.Str(description="Reason why token is not valid")
+
+
+class IntrospectionResponseSchema(Schema):
+    tokens = fields.List(fields.Nested(IntrospectionSchema), required=True)
+
+
+introspection_response_schema = IntrospectionResponseSchema()
+
+
+def error_reason(error: Optional[Exception]) -> str:
+    if isinstance(error, TokenExpired):
+        return "expired"
+    elif isinstance(error, UnknownKey):
+        return "unknown_key"
+
+    return "invalid"
+
+
+def legacy_jti(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()[:32]
+
+
+async def fetch_active_user(
+    request: web.Request,
+    storage: DBStorage,
+    user: User,
+    token_data: Dict[str, Any],
+) -> Tuple[User, int]:
+    config = request.app["config"].users
+
+    inactive = request.app["inactive_users"]
+    if inactive.loaded and user.key in inactive:
+        raise web.HTTPForbidden
+
+    # Recently fetched claims are reused as is, while the set of deactivated
+    # users guards against tokens of disabled accounts. Rotation carries the
+    # fetch time over, so frequent refreshes still hit the database.
+    claims_at = token_data.get("claims_at", 0)
+    if (
+        inactive.loaded
+        and not config.refresh_force_fetch
+        and time.time() - claims_at <= config.refresh_claims_max_age
+    ):
+        return user, claims_at
+
+    try:
+        service = UserService(storage, request.app["passwords"])
+        user = await service.fetch(key=user.key, active=True)
+    except EntityNotFound:
+        raise web.HTTPForbidden
+
+    return user, int(time.time())
+
+
 @register_operation(
     description="Get access token for user by session",
     parameters=(SessionParameter,),
@@ -29,14 +113,12 @@ from passport.storage import DBStorage
 @session_required
 async def access(request: web.Request) -> web.Response:
     config = request.app["config"]
-    generator = TokenGenerator(private_key=config.tokens.private_key)
 
-    access_token = generator.generate(
+    access_token = request.app["token_generator"].generate(
         request["user"], expire=config.tokens.access_token_expire
     )
 
-    schema = UserResponseSchema()
-    response = schema.dump({"user": request["user"]})
+    response = user_response_schema.dump({"user": request["user"]})
 
     return json_response(response, headers={"X-ACCESS-TOKEN": access_token})
 
@@ -60,26 +142,78 @@ async def refresh(request: web.Request) -> web.Response:
         raise web.HTTPUnauthorized(text="Refresh token required")
 
     try:
-        decoder = TokenDecoder(public_key=config.tokens.public_key)
-        user = decoder.decode(token, TokenType.refresh)
-    except BadToken:
+        token_data = request.app["token_decoder"].decode_payload(token)
+        user = load_user(token_data, TokenType.refresh)
+    except (BadToken, TokenExpired):
         raise web.HTTPForbidden
 
-    try:
-        storage = DBStorage(request.app["db"])
+    storage = DBStorage(request.app["db"])
+    revocation = RevocationService(storage, request.app["revoked_tokens"])
 
-        service = UserService(storage)
-        user = await service.fetch(key=user.key, active=True)
-    except EntityNotFound:
+    # Tokens issued before rotation was introduced carry no jti, revoke them
+    # under an id derived from the token itself so they stay single-use too.
+    jti = token_data.get("jti", None) or legacy_jti(token)
+    if revocation.is_revoked(jti):
         raise web.HTTPForbidden
 
-    generator = TokenGenerator(private_key=config.tokens.private_key)
+    user, claims_at = await fetch_active_user(
+        request, storage, user, token_data
+    )
+
+    expires = datetime.utcfromtimestamp(token_data["exp"])
+    if not await revocation.revoke(jti, user.key, expires):
+        raise web.HTTPForbidden
 
-    access_token = generator.generate(
-        user=user, expire=config.tokens.access_token_expire
+    generator = request.app["token_generator"]
+
+    response = user_response_schema.dump({"user": user})
+
+    return json_response(
+        response,
+        headers={
+            "X-ACCESS-TOKEN": generator.generate(
+                user=user, expire=config.tokens.access_token_expire
+            ),
+            "X-REFRESH-TOKEN": generator.generate(
+                user=user,
+                token_type=TokenType.refresh,
+                expire=config.tokens.refresh_token_expire,
+                claims_at=claims_at,
+            ),
+        },
     )
 
-    schema = UserResponseSchema()
-    response = schema.dump({"user": user})
 
-    return json_response(response, headers={"X-ACCESS-TOKEN": access_token})
+@register_operation(
+    description="Introspect access tokens",
+    request_body=RequestBody(
+        description="Access tokens to verify",
+        schema=IntrospectionPayloadSchema,  # type: ignore
+    ),
+    responses=(
+        JSONResponse(
+            description="Verification result for every token",
+            schema=IntrospectionResponseSchema,  # type: ignore
+        ),
+    ),
+)
+@validate_payload(IntrospectionPayloadSchema)
+async def introspect(
+    payload: Dict[str, List[str]], request: web.Request
+) -> web.Response:
+    results = request.app["introspection_decoder"].decode_many(
+        payload["tokens"]
+    )
+
+    tokens = []
+    for result in results:
+        if result.user is None:
+            tokens.append(
+                {"active": False, "error": error_reason(result.error)}
+            )
+        else:
+            tokens.append({"active": True, "user": result.user})
+
+    response = introspection_response_schema.dump({"tokens": tokens})
+
+    return json_response(response)
@@ -5,10 +5,7 @@ from aiohttp_micro.exceptions import (  # type: ignore
     EntityAlreadyExist,
     EntityNotFound,
 )
-from aiohttp_micro.handlers import (  # type: ignore
-    json_response,
-    validate_payload,
-)
+from aiohttp_micro.handlers import validate_payload  # type: ignore
 from aiohttp_openapi import (  # type: ignore
     JSONResponse,
     register_operation,
@@ -16,14 +13,17 @@ from aiohttp_openapi import (  # type: ignore
 )
 
 from passport.domain import TokenType
-from passport.exceptions import Forbidden
+from passport.exceptions import Forbidden, Overloaded
 from passport.handlers import (
     AccessTokenParameter,
     CredentialsPayloadSchema,
+    json_response,
+    service_unavailable,
     token_required,
+    user_response_schema,
     UserResponseSchema,
 )
-from passport.services.tokens import TokenGenerator
+from passport.timing import stage
 from passport.use_cases.users import LoginUseCase, RegisterUserUseCase
 
 
@@ -53,9 +53,10 @@ async def register(
         )
     except EntityAlreadyExist:
         return json_response({"errors": {"email": "Already exist"}}, status=422)
+    except Overloaded:
+        raise service_unavailable(request)
 
-    schema = UserResponseSchema()
-    response = schema.dump({"user": user})
+    response = user_response_schema.dump({"user": user})
 
     return json_response(response, status=201)
 
@@ -85,26 +86,26 @@ async def login(payload: Dict[str, str], request: web.Request) -> web.Response:
         raise web.HTTPForbidden()
     except EntityNotFound:
         raise web.HTTPNotFound()
+    except Overloaded:
+        raise service_unavailable(request)
 
     config = request.app["config"]
-    generator = TokenGenerator(private_key=config.tokens.private_key)
-
-    schema = UserResponseSchema()
-    response = schema.dump({"user": user})
-
-    return json_response(
-        response,
-        headers={
-            "X-ACCESS-TOKEN": generator.generate(
-                user, expire=config.tokens.access_token_expire
-            ),
-            "X-REFRESH-TOKEN": generator.generate(
-                user,
-                token_type=TokenType.refresh,
-                expire=config.tokens.refresh_token_expire,
-            ),
-        },
-    )
+    generator = request.app["token_generator"]
+
+    headers = {
+        "X-ACCESS-TOKEN": generator.generate(
+            user, expire=config.tokens.access_token_expire
+        ),
+        "X-REFRESH-TOKEN": generator.generate(
+            user,
+            token_type=TokenType.refresh,
+            expire=config.tokens.refresh_token_expire,
+        ),
+    }
+
+    with stage("serialize"):
+        response = user_response_schema.dump({"user": user})
+        return json_response(response, headers=headers)
 
 
 @register_operation(
@@ -119,7 +120,6 @@ async def login(payload: Dict[str, str], request: web.Request) -> web.Response:
 )
 @token_required()
 async def profile(request: web.Request) -> web.Response:
-    schema = UserResponseSchema()
-    response = schema.dump({"user": request["user"]})
+    response = user_response_schema.dump({"user": request["user"]})
 
     return json_response(response)
@@ -4,13 +4,16 @@ from typing import Dict
 
 from aiohttp import web
 from aiohttp_micro.exceptions import EntityNotFound  # type: ignore
-from aiohttp_micro.handlers import (  # type: ignore
+from aiohttp_micro.handlers import validate_payload  # type: ignore
+
+from passport.exceptions import Forbidden, Overloaded
+from passport.handlers import (
+    CredentialsPayloadSchema,
     json_response,
-    validate_payload,
+    service_unavailable,
+    session_required,
 )
-
-from passport.exceptions import Forbidden
-from passport.handlers import CredentialsPayloadSchema, session_required
+from passport.services.sessions import SessionService
 from passport.storage import DBStorage
 from passport.use_cases.users import LoginUseCase
 
@@ -25,6 +28,8 @@ async def login(payload: Dict[str, str], request: web.Request) -> web.Response:
         raise web.HTTPForbidden()
     except EntityNotFound:
         raise web.HTTPNotFound()
+    except Overloaded:
+        raise service_unavailable(request)
 
     config = request.app["config"]
 
@@ -32,7 +37,8 @@ async def login(payload: Dict[str, str], request: web.Request) -> web.Response:
     expires = datetime.now() + timedelta(days=config.sessions.expire)
 
     storage = DBStorage(database=request.app["db"])
-    await storage.sessions.add(user, session_key, expires)
+    service = SessionService(storage, request.app["sessions_cache"])
+    await service.add(user, session_key, expires)
 
     request.app["logger"].info("User logged in", user=user.email)
 
@@ -42,7 +48,7 @@ async def login(payload: Dict[str, str], request: web.Request) -> web.Response:
         value=session_key,
         max_age=config.sessions.expire * 24 * 60 * 60,
         domain=config.sessions.domain,
-        httponly="True",
+        httponly=True,
     )
 
     return response
@@ -54,6 +60,10 @@ async def logout(request: web.Request) -> web.Response:
 
     config = request.app["config"]
 
+    storage = DBStorage(database=request.app["db"])
+    service = SessionService(storage, request.app["sessions_cache"])
+    await service.remove(request.cookies[config.sessions.cookie])
+
     redirect = web.HTTPFound(location="/")
     redirect.del_cookie(
         name=config.sessions.cookie, domain=config.sessions.domain
@@ -0,0 +1,97 @@
+import asyncio
+import csv
+from itertools import islice
+from typing import Iterable, Iterator, List, TextIO, Tuple
+
+import click
+from aiohttp import web
+
+from passport.storage import DBStorage
+
+
+HEADER = ("email", "permission")
+
+
+def read_grants(source: TextIO) -> Iterator[Tuple[str, str]]:
+    for line, row in enumerate(csv.reader(source), start=1):
+        if not row or row[0].startswith("#"):
+            continue
+
+        values = tuple(value.strip() for value in row[:2])
+        if line == 1 and tuple(value.lower() for value in values) == HEADER:
+            continue
+
+        if len(values) < 2 or not all(values):
+            click.echo(f"Skip malformed row {line}: {row}", err=True)
+            continue
+
+        yield values[0], values[1]
+
+
+def chunked(
+    grants: Iterable[Tuple[str, str]], size: int
+) -> Iterator[List[Tuple[str, str]]]:
+    iterator = iter(grants)
+
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            break
+
+        yield chunk
+
+
+async def apply_grants(
+    app: web.Application, source: TextIO, chunk_size: int, revoke: bool
+) -> int:
+    runner = web.AppRunner(app)
+    await runner.setup()
+
+    total = 0
+    try:
+        storage = DBStorage(app["db"])
+
+        for chunk in chunked(read_grants(source), chunk_size):
+            if revoke:
+                total += await storage.users.remove_permissions(chunk)
+            else:
+                total += await storage.users.add_permissions(chunk)
+    finally:
+        await runner.cleanup()
+
+    return total
+
+
+@click.group()
+def permissions():
+    pass
+
+
+@permissions.command()
+@click.argument("source", type=click.File("r"))
+@click.option("--chunk-size", default=5000, show_default=True)
+@click.pass_context
+def grant(ctx, source: TextIO, chunk_size: int) -> None:
+    """Grant permissions from a CSV file with `email,permission` rows."""
+
+    loop = asyncio.get_event_loop()
+    count = loop.run_until_complete(
+        apply_grants(ctx.obj["app"], source, chunk_size, revoke=False)
+    )
+
+    click.echo(f"Granted {count} permissions")
+
+
+@permissions.command()
+@click.argument("source", type=click.File("r"))
+@click.option("--chunk-size", default=5000, show_default=True)
+@click.pass_context
+def revoke(ctx, source: TextIO, chunk_size: int) -> None:
+    """Revoke permissions from a CSV file with `email,permission` rows."""
+
+    loop = asyncio.get_event_loop()
+    count = loop.run_until_complete(
+        apply_grants(ctx.obj["app"], source, chunk_size, revoke=True)
+    )
+
+    click.echo(f"Revoked {count} permissions")
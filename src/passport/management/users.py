@@ -0,0 +1,195 @@
+import asyncio
+import csv
+import json
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional, TextIO
+
+import click
+from aiohttp import web
+from passlib.handlers.pbkdf2 import pbkdf2_sha512  # type: ignore
+
+from passport.domain import hash_password, PASSWORD_ROUNDS, User
+from passport.storage import DBStorage
+
+
+def read_records(source: TextIO, fmt: str) -> Iterator[Dict[str, Any]]:
+    if fmt == "csv":
+        yield from csv.DictReader(source)
+    else:
+        for number, line in enumerate(source, start=1):
+            line = line.strip()
+            if not line:
+                continue
+
+            try:
+                record = json.loads(line)
+            except ValueError:
+                record = None
+
+            if isinstance(record, dict):
+                yield record
+            else:
+                click.echo(f"Skip malformed line {number}", err=True)
+
+
+def build_users(records: List[Dict[str, Any]]) -> List[User]:
+    users = []
+    for record in records:
+        email = record.get("email", None)
+        password = record.get("password", None)
+
+        if not isinstance(email, str) or not email.strip():
+            click.echo("Skip record without email", err=True)
+            continue
+
+        if not isinstance(password, str) or not password:
+            click.echo(f"Skip record without password: {email}", err=True)
+            continue
+
+        users.append(
+            User(key=0, email=email.strip(), password=password)  # type: ignore
+        )
+
+    return users
+
+
+def read_checkpoint(path: Optional[str]) -> int:
+    if not path or not os.path.exists(path):
+        return 0
+
+    with open(path) as checkpoint:
+        return int(checkpoint.read().strip() or 0)
+
+
+def write_checkpoint(path: Optional[str], offset: int) -> None:
+    if not path:
+        return
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as checkpoint:
+        checkpoint.write(str(offset))
+
+    os.replace(tmp_path, path)
+
+
+async def prepare_users(
+    records: List[Dict[str, Any]], executor: Executor, rounds: int
+) -> List[User]:
+    users = build_users(records)
+
+    loop = asyncio.get_event_loop()
+    plain = [
+        user for user in users if not pbkdf2_sha512.identify(user.password)
+    ]
+    hashes = await asyncio.gather(
+        *(
+            loop.run_in_executor(executor, hash_password, user.password, rounds)
+            for user in plain
+        )
+    )
+
+    for user, password in zip(plain, hashes):
+        user.password = password
+
+    return users
+
+
+async def import_users(
+    app: web.Application,
+    source: TextIO,
+    fmt: str,
+    chunk_size: int,
+    workers: int,
+    rounds: int,
+    checkpoint: Optional[str],
+) -> None:
+    offset = read_checkpoint(checkpoint)
+    if offset:
+        click.echo(f"Resume import after {offset} records")
+
+    records = islice(read_records(source, fmt), offset, None)
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+
+    started = time.monotonic()
+    processed, imported = 0, 0
+
+    try:
+        storage = DBStorage(app["db"])
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            while True:
+                chunk = list(islice(records, chunk_size))
+                if not chunk:
+                    break
+
+                users = await prepare_users(chunk, executor, rounds)
+                imported += await storage.users.add_many(users)
+                processed += len(chunk)
+
+                write_checkpoint(checkpoint, offset + processed)
+
+                elapsed = time.monotonic() - started
+                click.echo(
+                    f"Processed {offset + processed} records, "
+                    f"imported {imported}, skipped {processed - imported}, "
+                    f"{processed / elapsed:.1f} records/s"
+                )
+    finally:
+        await runner.cleanup()
+
+
+@click.group()
+def users():
+    pass
+
+
+@users.command(name="import")
+@click.argument("source", type=click.File("r"))
+@click.option(
+    "--format",
+    "fmt",
+    type=click.Choice(["csv", "jsonl"]),
+    default="csv",
+    show_default=True,
+)
+@click.option(
+    "--chunk-size",
+    type=click.IntRange(1, 5000),
+    default=1000,
+    show_default=True,
+)
+@click.option("--workers", type=int, default=os.cpu_count(), show_default=True)
+@click.option("--rounds", type=int, default=PASSWORD_ROUNDS, show_default=True)
+@click.option("--checkpoint", type=click.Path(dir_okay=False), default=None)
+@click.pass_context
+def import_(
+    ctx,
+    source: TextIO,
+    fmt: str,
+    chunk_size: int,
+    workers: int,
+    rounds: int,
+    checkpoint: Optional[str],
+) -> None:
+    """Import users from CSV or JSONL records with email and password.
+
+    Passwords that are already pbkdf2-sha512 hashes are stored as is.
+    """
+
+    loop = asyncio.get_event_loop()
+    loop.run_until_complete(
+        import_users(
+            ctx.obj["app"],
+            source,
+            fmt=fmt,
+            chunk_size=chunk_size,
+            workers=workers,
+            rounds=rounds,
+            checkpoint=checkpoint,
+        )
+    )
@@ -0,0 +1,60 @@
+from prometheus_client import Counter, Histogram  # type: ignore
+
+
+sessions_reaped = Counter(
+    "passport_sessions_reaped_total", "Expired sessions removed by the reaper"
+)
+sessions_reap_duration = Histogram(
+    "passport_sessions_reap_duration_seconds",
+    "Time spent on a single pass of the expired sessions reaper",
+)
+
+STALL_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+)
+
+loop_lag = Histogram(
+    "passport_loop_lag_seconds",
+    "Delay of a scheduled wake-up on the event loop",
+    buckets=STALL_BUCKETS,
+)
+handler_blocking = Histogram(
+    "passport_handler_blocking_seconds",
+    "Longest synchronous step of a request handler",
+    ["route"],
+    buckets=STALL_BUCKETS,
+)
+stage_duration = Histogram(
+    "passport_stage_duration_seconds",
+    "Time spent in a single stage of request processing",
+    ["stage"],
+    buckets=STALL_BUCKETS,
+)
+
+query_duration = Histogram(
+    "passport_db_query_duration_seconds",
+    "Time spent executing a database query",
+    ["query"],
+    buckets=STALL_BUCKETS,
+)
+pool_wait = Histogram(
+    "passport_db_pool_wait_seconds",
+    "Time spent waiting for a database connection from the pool",
+    buckets=STALL_BUCKETS,
+)
+request_queries = Histogram(
+    "passport_db_queries_per_request",
+    "Number of database queries issued while handling a request",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34),
+)
@@ -0,0 +1,101 @@
+import asyncio
+import time
+from contextlib import suppress
+from typing import Any, AsyncGenerator, Awaitable, Callable, Generator
+
+from aiohttp import web
+
+from passport.metrics import handler_blocking, loop_lag
+
+
+class TimedCoroutine:
+    __slots__ = ("_coro", "max_step")
+
+    def __init__(self, coro: Awaitable) -> None:
+        self._coro = coro.__await__()
+        self.max_step = 0.0
+
+    def __await__(self) -> Generator[Any, Any, Any]:
+        send: Callable[..., Any] = self._coro.send
+        value: Any = None
+
+        while True:
+            started = time.perf_counter()
+            try:
+                future = send(value)
+            except StopIteration as exc:
+                return exc.value
+            finally:
+                self.max_step = max(
+                    self.max_step, time.perf_counter() - started
+                )
+
+            try:
+                value = yield future
+            except GeneratorExit:
+                self._coro.close()
+                raise
+            except BaseException as exc:  # noqa: B036
+                # Thrown exceptions are handed over to the wrapped coroutine.
+                send, value = self._coro.throw, exc
+            else:
+                send = self._coro.send
+
+
+def route_name(request: web.Request) -> str:
+    resource = request.match_info.route.resource
+    if resource is None:
+        return "unknown"
+
+    return resource.name or resource.canonical
+
+
+@web.middleware
+async def blocking_middleware(
+    request: web.Request, handler: Callable[[web.Request], Awaitable]
+) -> web.StreamResponse:
+    timed = TimedCoroutine(handler(request))
+    try:
+        return await timed
+    finally:
+        route = route_name(request)
+        handler_blocking.labels(route).observe(timed.max_step)
+
+        threshold = request.app["config"].monitor.slow_callback_threshold
+        if timed.max_step * 1000 > threshold:
+            request.app["logger"].warning(
+                "Slow callback",
+                route=route,
+                duration=round(timed.max_step * 1000, 1),
+            )
+
+
+async def watch_loop_lag(app: web.Application) -> None:
+    config = app["config"].monitor
+    interval = config.lag_interval / 1000
+
+    loop = asyncio.get_event_loop()
+    while True:
+        started = loop.time()
+        await asyncio.sleep(interval)
+        lag = max(loop.time() - started - interval, 0.0)
+
+        loop_lag.observe(lag)
+
+        if lag * 1000 > config.lag_threshold:
+            app["logger"].warning(
+                "Event loop lag", duration=round(lag * 1000, 1)
+            )
+
+
+async def monitor_ctx(app: web.Application) -> AsyncGenerator[None, None]:
+    task = None
+    if app["config"].monitor.lag_interval > 0:
+        task = asyncio.ensure_future(watch_loop_lag(app))
+
+    yield
+
+    if task:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
@@ -0,0 +1,196 @@
+import base64
+import hashlib
+import json
+import re
+from typing import Any, Dict, Iterable, List, Type
+
+import jwt
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+from jwt.algorithms import Algorithm
+
+
+CURVES: Dict[str, Type[ec.EllipticCurve]] = {
+    "P-256": ec.SECP256R1,
+    "P-384": ec.SECP384R1,
+    "P-521": ec.SECP521R1,
+}
+CURVE_NAMES = {"secp256r1": "P-256", "secp384r1": "P-384", "secp521r1": "P-521"}
+
+ALGORITHMS = ("RS256", "ES256", "EdDSA")
+
+PEM_BLOCK = re.compile(
+    r"-----BEGIN ([A-Z ]+)-----.+?-----END \1-----", re.DOTALL
+)
+
+
+class Ed25519Algorithm(Algorithm):
+    def prepare_key(self, key: Any) -> Any:
+        if isinstance(
+            key, (ed25519.Ed25519PrivateKey, ed25519.Ed25519PublicKey)
+        ):
+            return key
+
+        if isinstance(key, str):
+            if "PRIVATE" in key:
+                return load_private_key(key)
+            return load_public_key(key)
+
+        raise TypeError("Expecting an Ed25519 key.")
+
+    def sign(self, msg: bytes, key: Any) -> bytes:
+        return key.sign(msg)
+
+    def verify(self, msg: bytes, key: Any, sig: bytes) -> bool:
+        if isinstance(key, ed25519.Ed25519PrivateKey):
+            key = key.public_key()
+
+        try:
+            key.verify(sig, msg)
+        except InvalidSignature:
+            return False
+        return True
+
+
+try:
+    jwt.register_algorithm("EdDSA", Ed25519Algorithm())
+except ValueError:
+    # Newer PyJWT releases ship EdDSA support out of the box.
+    pass
+
+
+def algorithm_for(key: Any) -> str:
+    if isinstance(key, (rsa.RSAPrivateKey, rsa.RSAPublicKey)):
+        return "RS256"
+
+    if isinstance(
+        key, (ec.EllipticCurvePrivateKey, ec.EllipticCurvePublicKey)
+    ) and isinstance(key.curve, ec.SECP256R1):
+        return "ES256"
+
+    if isinstance(key, (ed25519.Ed25519PrivateKey, ed25519.Ed25519PublicKey)):
+        return "EdDSA"
+
+    raise ValueError(f"Unsupported key type: {type(key).__name__}")
+
+
+def load_private_key(key: str) -> Any:
+    return serialization.load_pem_private_key(
+        key.strip().encode("utf-8"), password=None, backend=default_backend()
+    )
+
+
+def load_public_key(key: str) -> Any:
+    data = key.strip().encode("utf-8")
+
+    if data.startswith(b"ssh-") or data.startswith(b"ecdsa-"):
+        return serialization.load_ssh_public_key(data, default_backend())
+
+    return serialization.load_pem_public_key(data, default_backend())
+
+
+def load_public_keys(keys: str) -> List[Any]:
+    loaded = [
+        load_public_key(match.group(0)) for match in PEM_BLOCK.finditer(keys)
+    ]
+
+    for line in PEM_BLOCK.sub("", keys).splitlines():
+        if line.strip():
+            loaded.append(load_public_key(line))
+
+    return loaded
+
+
+def b64(value: bytes) -> str:
+    return base64.urlsafe_b64encode(value).rstrip(b"=").decode("ascii")
+
+
+def b64_int(value: int) -> str:
+    return b64(value.to_bytes((value.bit_length() + 7) // 8 or 1, "big"))
+
+
+def to_jwk(public_key: Any) -> Dict[str, str]:
+    if isinstance(public_key, rsa.RSAPublicKey):
+        rsa_numbers = public_key.public_numbers()
+        return {
+            "kty": "RSA",
+            "e": b64_int(rsa_numbers.e),
+            "n": b64_int(rsa_numbers.n),
+        }
+
+    if isinstance(public_key, ec.EllipticCurvePublicKey):
+        ec_numbers = public_key.public_numbers()
+        size = (public_key.curve.key_size + 7) // 8
+        return {
+            "kty": "EC",
+            "crv": CURVE_NAMES[public_key.curve.name],
+            "x": b64(ec_numbers.x.to_bytes(size, "big")),
+            "y": b64(ec_numbers.y.to_bytes(size, "big")),
+        }
+
+    if isinstance(public_key, ed25519.Ed25519PublicKey):
+        raw = public_key.public_bytes(
+            serialization.Encoding.Raw, serialization.PublicFormat.Raw
+        )
+        return {"kty": "OKP", "crv": "Ed25519", "x": b64(raw)}
+
+    raise ValueError(f"Unsupported key type: {type(public_key).__name__}")
+
+
+def b64_decode(value: str) -> bytes:
+    return base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+
+
+def b64_decode_int(value: str) -> int:
+    return int.from_bytes(b64_decode(value), "big")
+
+
+def from_jwk(jwk: Dict[str, str]) -> Any:
+    if jwk["kty"] == "RSA":
+        numbers = rsa.RSAPublicNumbers(
+            e=b64_decode_int(jwk["e"]), n=b64_decode_int(jwk["n"])
+        )
+        return numbers.public_key(default_backend())
+
+    if jwk["kty"] == "EC":
+        point = ec.EllipticCurvePublicNumbers(
+            x=b64_decode_int(jwk["x"]),
+            y=b64_decode_int(jwk["y"]),
+            curve=CURVES[jwk["crv"]](),
+        )
+        return point.public_key(default_backend())
+
+    if jwk["kty"] == "OKP" and jwk["crv"] == "Ed25519":
+        return ed25519.Ed25519PublicKey.from_public_bytes(b64_decode(jwk["x"]))
+
+    raise ValueError(f"Unsupported key type: {jwk['kty']}")
+
+
+def key_id(public_key: Any) -> str:
+    # RFC 7638 thumbprint over the required members of the JWK.
+    jwk = json.dumps(to_jwk(public_key), sort_keys=True, separators=(",", ":"))
+    return b64(hashlib.sha256(jwk.encode("utf-8")).digest())
+
+
+class KeySet:
+    __slots__ = ("keys",)
+
+    def __init__(self, public_keys: Iterable[Any]) -> None:
+        self.keys: Dict[str, Any] = {
+            key_id(public_key): public_key for public_key in public_keys
+        }
+
+    def jwks(self) -> Dict[str, List[Dict[str, str]]]:
+        return {
+            "keys": [
+                dict(
+                    to_jwk(public_key),
+                    kid=kid,
+                    use="sig",
+                    alg=algorithm_for(public_key),
+                )
+                for kid, public_key in self.keys.items()
+            ]
+        }
@@ -0,0 +1,69 @@
+import asyncio
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from typing import Any, AsyncGenerator, Callable, Optional
+
+from aiohttp import web
+
+from passport.domain import hash_password, verify_password
+from passport.exceptions import Overloaded
+
+
+def create_executor(kind: str, workers: int) -> Executor:
+    if kind == "process":
+        return ProcessPoolExecutor(max_workers=workers)
+    elif kind == "thread":
+        return ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="passwords"
+        )
+
+    raise ValueError(f"Unknown password hasher executor: {kind}")
+
+
+class PasswordHasher:
+    __slots__ = ("_executor", "_max_pending", "_pending", "_rounds")
+
+    def __init__(
+        self, executor: Executor, max_pending: int, rounds: int = 10000
+    ) -> None:
+        self._executor = executor
+        self._max_pending = max_pending
+        self._pending = 0
+        self._rounds = rounds
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    async def hash(self, password: str) -> str:
+        return await self._run(hash_password, password, self._rounds)
+
+    async def verify(self, password: str, password_hash: Optional[str]) -> bool:
+        return await self._run(verify_password, password, password_hash)
+
+    async def _run(self, func: Callable, *args: Any) -> Any:
+        if self._pending >= self._max_pending:
+            raise Overloaded()
+
+        self._pending += 1
+        try:
+            loop = asyncio.get_event_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+        finally:
+            self._pending -= 1
+
+
+async def passwords_ctx(app: web.Application) -> AsyncGenerator[None, None]:
+    config = app["config"].passwords
+
+    executor = create_executor(config.executor, config.workers)
+    app["passwords"] = PasswordHasher(
+        executor, max_pending=config.max_pending, rounds=config.rounds
+    )
+
+    yield
+
+    executor.shutdown(wait=True)
@@ -0,0 +1,115 @@
+import asyncio
+import heapq
+from contextlib import suppress
+from datetime import datetime
+from typing import AsyncGenerator, Dict, List, Tuple
+
+from aiohttp import web
+
+from passport.domain.storage import Storage
+from passport.storage import DBStorage
+
+
+class RevocationIndex:
+    __slots__ = ("_tokens", "_expiry", "last_key")
+
+    def __init__(self) -> None:
+        self._tokens: Dict[str, datetime] = {}
+        self._expiry: List[Tuple[datetime, str]] = []
+        self.last_key = 0
+
+    def __contains__(self, jti: str) -> bool:
+        return jti in self._tokens
+
+    def __len__(self) -> int:
+        return len(self._tokens)
+
+    def add(self, jti: str, expires: datetime) -> None:
+        if self._tokens.get(jti, None) == expires:
+            return
+
+        self._tokens[jti] = expires
+        heapq.heappush(self._expiry, (expires, jti))
+
+    def prune(self, now: datetime) -> int:
+        removed = 0
+
+        while self._expiry and self._expiry[0][0] <= now:
+            expires, jti = heapq.heappop(self._expiry)
+
+            # Entries re-added with another expiry leave stale heap items.
+            if self._tokens.get(jti, None) == expires:
+                del self._tokens[jti]
+                removed += 1
+
+        return removed
+
+
+class RevocationService:
+    def __init__(self, storage: Storage, index: RevocationIndex) -> None:
+        self.storage = storage
+        self.index = index
+
+    def is_revoked(self, jti: str) -> bool:
+        return jti in self.index
+
+    async def revoke(self, jti: str, user_key: int, expires: datetime) -> bool:
+        revoked = await self.storage.tokens.add(jti, user_key, expires)
+        self.index.add(jti, expires)
+
+        return revoked
+
+    async def sync(self, batch_size: int) -> int:
+        loaded = 0
+
+        while True:
+            rows = await self.storage.tokens.fetch_since(
+                self.index.last_key, batch_size
+            )
+            for key, jti, expires in rows:
+                self.index.add(jti, expires)
+                self.index.last_key = max(self.index.last_key, key)
+
+            loaded += len(rows)
+            if len(rows) < batch_size:
+                return loaded
+
+    async def remove_expired(self, batch_size: int) -> int:
+        now = datetime.utcnow()
+
+        self.index.prune(now)
+        return await self.storage.tokens.remove_expired(now, batch_size)
+
+
+async def sync_revocations(app: web.Application) -> None:
+    config = app["config"].tokens
+
+    while True:
+        storage = DBStorage(app["db"])
+        service = RevocationService(storage, app["revoked_tokens"])
+
+        try:
+            loaded = await service.sync(config.revocation_batch_size)
+            await service.remove_expired(config.revocation_batch_size)
+        except Exception:
+            app["logger"].exception("Revoked tokens sync failed")
+        else:
+            if loaded:
+                app["logger"].debug("Revoked tokens loaded", count=loaded)
+
+        await asyncio.sleep(config.revocation_sync_interval)
+
+
+async def revocation_ctx(app: web.Application) -> AsyncGenerator[None, None]:
+    app["revoked_tokens"] = RevocationIndex()
+
+    task = None
+    if app["config"].tokens.revocation_sync_interval > 0:
+        task = asyncio.ensure_future(sync_revocations(app))
+
+    yield
+
+    if task:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
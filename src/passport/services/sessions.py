@@ -0,0 +1,100 @@
+import asyncio
+import hashlib
+import time
+from contextlib import suppress
+from datetime import datetime
+from typing import AsyncGenerator
+
+from aiohttp import web
+
+from passport.cache import CacheBackend
+from passport.domain import User
+from passport.domain.storage import Storage
+from passport.metrics import sessions_reap_duration, sessions_reaped
+from passport.storage import DBStorage
+
+
+class SessionService:
+    def __init__(self, storage: Storage, cache: CacheBackend[User]) -> None:
+        self.storage = storage
+        self.cache = cache
+
+    def _cache_key(self, key: str) -> str:
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    async def fetch(self, key: str) -> User:
+        cache_key = self._cache_key(key)
+
+        user = await self.cache.get(cache_key)
+        if user is None:
+            session = await self.storage.sessions.fetch_session(key=key)
+            user = session.user
+
+            expires_in = session.expires - datetime.now()
+            await self.cache.set(
+                cache_key, user, ttl=expires_in.total_seconds()
+            )
+
+        return user
+
+    async def add(self, user: User, key: str, expires: datetime) -> None:
+        await self.storage.sessions.add(user, key, expires)
+
+    async def remove(self, key: str) -> None:
+        await self.storage.sessions.remove(key)
+        await self.cache.delete(self._cache_key(key))
+
+    async def remove_expired(self, batch_size: int) -> int:
+        now = datetime.now()
+        total = 0
+
+        while True:
+            removed = await self.storage.sessions.remove_expired(
+                now, limit=batch_size
+            )
+            total += removed
+
+            if removed < batch_size:
+                break
+
+        return total
+
+
+async def reap_sessions(app: web.Application) -> None:
+    config = app["config"].sessions
+
+    while True:
+        await asyncio.sleep(config.reaper_interval)
+
+        storage = DBStorage(app["db"])
+        service = SessionService(storage, app["sessions_cache"])
+
+        started = time.perf_counter()
+        try:
+            removed = await service.remove_expired(config.reaper_batch_size)
+        except Exception:
+            app["logger"].exception("Expired sessions reaping failed")
+            continue
+
+        elapsed = time.perf_counter() - started
+
+        sessions_reaped.inc(removed)
+        sessions_reap_duration.observe(elapsed)
+
+        if removed:
+            app["logger"].info(
+                "Expired sessions removed", count=removed, elapsed=elapsed
+            )
+
+
+async def reaper_ctx(app: web.Application) -> AsyncGenerator[None, None]:
+    task = None
+    if app["config"].sessions.reaper_interval > 0:
+        task = asyncio.ensure_future(reap_sessions(app))
+
+    yield
+
+    if task:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
@@ -1,70 +1,320 @@
+import hashlib
+import json
+import time
+import uuid
+from concurrent.futures import Executor
+from dataclasses import dataclass
 from datetime import datetime, timedelta
+from functools import partial
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 import jwt
 
-from passport.domain import TokenType, User
-from passport.exceptions import BadToken, TokenExpired
+from passport.cache import TTLCache
+from passport.domain import Permission, TokenType, User
+from passport.exceptions import BadToken, TokenExpired, UnknownKey
+from passport.services.keys import (
+    algorithm_for,
+    ALGORITHMS,
+    b64_decode,
+    key_id,
+    load_private_key,
+    load_public_key,
+)
+from passport.timing import stage
+
+
+@dataclass
+class DecodeResult:
+    token: str
+    user: Optional[User] = None
+    error: Optional[Exception] = None
+    expires: float = 0
+
+
+def load_user(token_data: Dict[str, Any], token_type: TokenType) -> User:
+    if token_data.get("token_type", None) != token_type.value:
+        raise BadToken()
+
+    if "user" in token_data:
+        try:
+            user_key = int(token_data["user"].get("id", None))
+        except (TypeError, ValueError):
+            raise BadToken()
+    else:
+        raise BadToken()
+
+    return User(
+        key=user_key,
+        email=token_data["user"].get("email", ""),
+        permissions=[
+            Permission(key=0, name=name)  # type: ignore
+            for name in token_data["user"].get("permissions", [])
+        ],
+    )  # type: ignore
 
 
 class TokenGenerator:
-    __slots__ = ("_private_key",)
+    __slots__ = ("_private_key", "_kid", "_algorithm")
+
+    def __init__(
+        self, private_key: Union[str, Any], algorithm: str = None
+    ) -> None:
+        if isinstance(private_key, str):
+            private_key = load_private_key(private_key)
+
+        key_algorithm = algorithm_for(private_key)
+        if algorithm and algorithm != key_algorithm:
+            raise ValueError(
+                f"Private key could not be used with {algorithm} algorithm"
+            )
 
-    def __init__(self, private_key: str) -> None:
         self._private_key = private_key
+        self._kid = key_id(private_key.public_key())
+        self._algorithm = key_algorithm
+
+    @property
+    def kid(self) -> str:
+        return self._kid
+
+    @property
+    def algorithm(self) -> str:
+        return self._algorithm
 
     def generate(
         self,
         user: User,
         token_type: TokenType = TokenType.access,
         expire: int = 600,
+        claims_at: int = None,
     ) -> str:
         now = datetime.utcnow()
 
-        return jwt.encode(
-            {
-                "user": {"id": user.key, "email": user.email},
-                "token_type": token_type.value,
-                "iss": "urn:passport",
-                "exp": now + timedelta(seconds=expire),
-                "iat": now,
+        payload: Dict[str, Any] = {
+            "user": {
+                "id": user.key,
+                "email": user.email,
+                "permissions": [
+                    permission.name for permission in user.permissions
+                ],
             },
-            self._private_key,
-            algorithm="RS256",
-        ).decode("utf-8")
+            "token_type": token_type.value,
+            "iss": "urn:passport",
+            "exp": now + timedelta(seconds=expire),
+            "iat": now,
+        }
+
+        if token_type == TokenType.refresh:
+            payload["jti"] = uuid.uuid4().hex
+            # Moment the user claims were last read from the database, kept
+            # as is when a refresh reuses them.
+            payload["claims_at"] = (
+                int(time.time()) if claims_at is None else claims_at
+            )
+
+        with stage("tokens.sign"):
+            token = jwt.encode(
+                payload,
+                self._private_key,
+                algorithm=self._algorithm,
+                headers={"kid": self._kid},
+            )
+
+        return token.decode("utf-8")
 
 
 class TokenDecoder:
-    __slots__ = ("_public_key",)
+    __slots__ = ("_kid", "_keys", "_algorithms")
 
-    def __init__(self, public_key: str) -> None:
-        self._public_key = public_key
+    def __init__(
+        self,
+        public_key: Union[str, Any],
+        extra_keys: Iterable[Any] = (),
+        algorithms: Iterable[str] = ALGORITHMS,
+    ) -> None:
+        if isinstance(public_key, str):
+            public_key = load_public_key(public_key)
+
+        self._kid = key_id(public_key)
+        self._keys = {key_id(key): key for key in (public_key, *extra_keys)}
+
+        # Every key verifies only its own algorithm, so a token could not
+        # switch a key to another algorithm through its header. Keys with
+        # an algorithm that is not accepted verify nothing at all.
+        accepted = set(algorithms)
+        self._algorithms: Dict[str, List[str]] = {}
+        for kid, key in self._keys.items():
+            algorithm = algorithm_for(key)
+            if algorithm in accepted:
+                self._algorithms[kid] = [algorithm]
+
+    @property
+    def keys(self) -> Dict[str, Any]:
+        return self._keys
+
+    def _resolve_kid(self, token: str) -> str:
+        # Only the header segment is parsed, so the result depends on it
+        # alone and could be shared by tokens with the same header.
+        try:
+            header = json.loads(b64_decode(token.partition(".")[0]))
+        except ValueError:
+            raise BadToken()
+
+        if not isinstance(header, dict):
+            raise BadToken()
+
+        kid = header.get("kid", self._kid)
+        if not isinstance(kid, str):
+            raise BadToken()
+
+        if kid not in self._keys:
+            raise UnknownKey()
+
+        return kid
+
+    def _verify(self, token: str, kid: str) -> Dict[str, Any]:
+        if kid not in self._algorithms:
+            raise BadToken()
 
-    def decode(
-        self, token: str, token_type: TokenType = TokenType.access
-    ) -> User:
         try:
-            token_data = jwt.decode(
+            return jwt.decode(
                 token,
-                self._public_key,
+                self._keys[kid],
                 issuer="urn:passport",
-                algorithms="RS256",
+                algorithms=self._algorithms[kid],
             )
         except jwt.ExpiredSignatureError:
             raise TokenExpired()
-        except jwt.DecodeError:
+        except jwt.InvalidTokenError:
             raise BadToken()
 
-        if token_data.get("token_type", None) != token_type.value:
-            raise BadToken()
+    def _verify_result(
+        self, item: Tuple[str, str], token_type: TokenType
+    ) -> DecodeResult:
+        token, kid = item
+        try:
+            token_data = self._verify(token, kid)
+            user = load_user(token_data, token_type)
+        except (BadToken, TokenExpired) as exc:
+            return DecodeResult(token=token, error=exc)
+
+        return DecodeResult(
+            token=token, user=user, expires=token_data.get("exp", 0)
+        )
+
+    def decode_payload(self, token: str) -> Dict[str, Any]:
+        return self._verify(token, self._resolve_kid(token))
+
+    def decode(
+        self, token: str, token_type: TokenType = TokenType.access
+    ) -> User:
+        token_data = self.decode_payload(token)
+
+        return load_user(token_data, token_type)
 
-        if "user" in token_data:
-            try:
-                user_key = int(token_data["user"].get("id", None))
-            except ValueError:
-                raise BadToken()
+    def decode_many(
+        self,
+        tokens: Sequence[str],
+        token_type: TokenType = TokenType.access,
+        executor: Executor = None,
+    ) -> List[DecodeResult]:
+        results: Dict[str, DecodeResult] = {}
+        kids: Dict[str, Union[str, Exception]] = {}
+        pending: List[Tuple[str, str]] = []
+
+        for token in dict.fromkeys(tokens):
+            # Tokens issued by the same key share the header segment.
+            header = token.partition(".")[0]
+            if header not in kids:
+                try:
+                    kids[header] = self._resolve_kid(token)
+                except BadToken as exc:
+                    kids[header] = exc
+
+            kid = kids[header]
+            if isinstance(kid, Exception):
+                results[token] = DecodeResult(token=token, error=kid)
+            else:
+                pending.append((token, kid))
+
+        verify = partial(self._verify_result, token_type=token_type)
+        if executor is not None and len(pending) > 1:
+            verified: Iterable[DecodeResult] = executor.map(verify, pending)
         else:
-            raise BadToken()
+            verified = map(verify, pending)
+
+        for result in verified:
+            results[result.token] = result
+
+        return [results[token] for token in tokens]
+
+
+class CachedTokenDecoder:
+    __slots__ = ("_decoder", "_cache")
+
+    def __init__(self, decoder: TokenDecoder, cache: TTLCache[User]) -> None:
+        self._decoder = decoder
+        self._cache = cache
+
+    @property
+    def cache(self) -> TTLCache[User]:
+        return self._cache
+
+    def _cache_key(self, token: str, token_type: TokenType) -> Any:
+        return (token_type, hashlib.sha256(token.encode("utf-8")).digest())
+
+    def decode(
+        self, token: str, token_type: TokenType = TokenType.access
+    ) -> User:
+        key = self._cache_key(token, token_type)
+
+        user = self._cache.get(key)
+        if user is None:
+            token_data = self._decoder.decode_payload(token)
+            user = load_user(token_data, token_type)
+
+            expires_in = token_data.get("exp", 0) - time.time()
+            self._cache.set(key, user, ttl=expires_in)
+
+        return user
+
+    def decode_many(
+        self,
+        tokens: Sequence[str],
+        token_type: TokenType = TokenType.access,
+        executor: Executor = None,
+    ) -> List[DecodeResult]:
+        results: Dict[str, DecodeResult] = {}
+        missed: List[str] = []
+
+        for token in dict.fromkeys(tokens):
+            user = self._cache.get(self._cache_key(token, token_type))
+            if user is None:
+                missed.append(token)
+            else:
+                results[token] = DecodeResult(token=token, user=user)
+
+        if missed:
+            now = time.time()
+            for result in self._decoder.decode_many(
+                missed, token_type, executor
+            ):
+                if result.user is not None:
+                    self._cache.set(
+                        self._cache_key(result.token, token_type),
+                        result.user,
+                        ttl=result.expires - now,
+                    )
+
+                results[result.token] = result
 
-        return User(
-            key=user_key, email=token_data["user"].get("email", "")
-        )  # type: ignore
+        return [results[token] for token in tokens]
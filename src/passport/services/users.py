@@ -1,24 +1,30 @@
-from aiohttp_micro.exceptions import EntityAlreadyExist  # type: ignore
+import asyncio
+from contextlib import suppress
+from datetime import datetime
+from typing import AsyncGenerator, Dict, FrozenSet
+
+from aiohttp import web
 
 from passport.domain import User
 from passport.domain.storage import Storage
 from passport.exceptions import Forbidden
+from passport.services.passwords import PasswordHasher
+from passport.storage import DBStorage
+from passport.timing import stage
 
 
 class UserService:
-    def __init__(self, storage: Storage) -> None:
+    def __init__(self, storage: Storage, hasher: PasswordHasher) -> None:
         self.storage = storage
+        self.hasher = hasher
 
     async def register(self, email: str, password: str) -> User:
-        exist = await self.storage.users.exists(email)
-
-        if exist:
-            raise EntityAlreadyExist()
-
+        # Duplicates are rejected by the insert itself, which raises
+        # EntityAlreadyExist when the email is already taken.
         user = User(  # type: ignore
             key=0, email=email, password="", is_superuser=False, permissions=[]
         )
-        user.set_password(password)
+        user.password = await self.hasher.hash(password)
 
         await self.storage.users.add(user)
 
@@ -27,7 +33,8 @@ class UserService:
     async def login(self, email: str, password: str) -> User:
         user = await self.storage.users.fetch_by_email(email)
 
-        is_valid = user.verify_password(password)
+        with stage("passwords.verify"):
+            is_valid = await self.hasher.verify(password, user.password)
         if not is_valid:
             raise Forbidden()
 
@@ -37,3 +44,114 @@ class UserService:
         user = await self.storage.users.fetch_by_key(key)
 
         return user
+
+
+class LastLoginRecorder:
+    def __init__(self, buffer_size: int) -> None:
+        self._buffer_size = buffer_size
+        self._logins: Dict[int, datetime] = {}
+        self._full = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self._logins)
+
+    def record(self, user: User) -> None:
+        self._logins[user.key] = datetime.utcnow()
+
+        if len(self._logins) >= self._buffer_size:
+            self._full.set()
+
+    async def wait(self, timeout: float) -> None:
+        with suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(self._full.wait(), timeout=timeout)
+
+    async def flush(self, storage: Storage) -> int:
+        logins, self._logins = self._logins, {}
+        self._full.clear()
+
+        try:
+            await storage.users.update_last_login(logins)
+        except Exception:
+            for key, last_login in logins.items():
+                self._logins.setdefault(key, last_login)
+            raise
+
+        return len(logins)
+
+
+class InactiveUsers:
+    __slots__ = ("_keys", "loaded")
+
+    def __init__(self) -> None:
+        self._keys: FrozenSet[int] = frozenset()
+        self.loaded = False
+
+    def __contains__(self, key: int) -> bool:
+        return key in self._keys
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    async def reload(self, storage: Storage) -> int:
+        self._keys = frozenset(await storage.users.fetch_inactive_keys())
+        self.loaded = True
+
+        return len(self._keys)
+
+
+async def flush_last_login(app: web.Application) -> None:
+    config = app["config"].users
+    recorder = app["last_login"]
+
+    while True:
+        await recorder.wait(config.last_login_flush_interval)
+
+        try:
+            await recorder.flush(DBStorage(app["db"]))
+        except Exception:
+            app["logger"].exception("Last login flush failed")
+
+
+async def last_login_ctx(app: web.Application) -> AsyncGenerator[None, None]:
+    recorder = LastLoginRecorder(app["config"].users.last_login_buffer_size)
+    app["last_login"] = recorder
+
+    task = asyncio.ensure_future(flush_last_login(app))
+
+    yield
+
+    task.cancel()
+    with suppress(asyncio.CancelledError):
+        await task
+
+    await recorder.flush(DBStorage(app["db"]))
+
+
+async def reload_inactive_users(app: web.Application) -> None:
+    config = app["config"].users
+    inactive = app["inactive_users"]
+
+    while True:
+        try:
+            await inactive.reload(DBStorage(app["db"]))
+        except Exception:
+            app["logger"].exception("Inactive users reload failed")
+
+        await asyncio.sleep(config.inactive_reload_interval)
+
+
+async def inactive_users_ctx(
+    app: web.Application,
+) -> AsyncGenerator[None, None]:
+    app["inactive_users"] = InactiveUsers()
+
+    task = None
+    if app["config"].users.inactive_reload_interval > 0:
+        task = asyncio.ensure_future(reload_inactive_users(app))
+
+    yield
+
+    if task:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
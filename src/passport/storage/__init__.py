@@ -5,6 +5,7 @@ from databases import Database
 
 from passport.domain.storage import Storage
 from passport.storage.sessions import SessionDBStorage
+from passport.storage.tokens import RevokedTokensDBRepo
 from passport.storage.users import UsersDBRepo
 
 
@@ -13,4 +14,5 @@ class DBStorage(Storage, AbstractDBStorage):
         super().__init__(database=database)
 
         self.sessions = SessionDBStorage(database=database)
+        self.tokens = RevokedTokensDBRepo(database=database)
         self.users = UsersDBRepo(database=database)
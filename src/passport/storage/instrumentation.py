@@ -0,0 +1,163 @@
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Union,
+)
+
+from aiohttp import web
+from databases import Database
+from sqlalchemy.sql import ClauseElement  # type: ignore
+
+from passport.metrics import pool_wait, query_duration, request_queries
+from passport.monitor import route_name
+from passport.timing import current_stage
+
+
+Query = Union[ClauseElement, str]
+
+
+class QueryCounter:
+    __slots__ = ("count",)
+
+    def __init__(self) -> None:
+        self.count = 0
+
+
+queries_counter: ContextVar[Optional[QueryCounter]] = ContextVar(
+    "queries_counter", default=None
+)
+
+
+def query_name(query: Query) -> str:
+    if isinstance(query, str):
+        words = query.split(None, 1)
+        return words[0].lower() if words else "unknown"
+
+    name = getattr(query, "__visit_name__", "unknown")
+    table = getattr(query, "table", None)
+    if table is not None and hasattr(table, "name"):
+        return f"{name}.{table.name}"
+
+    return name
+
+
+def sql_template(query: Query) -> str:
+    if isinstance(query, str):
+        return " ".join(query.split())
+
+    return " ".join(str(query).split())
+
+
+class InstrumentedDatabase:
+    def __init__(
+        self, database: Database, logger: Any, slow_query_threshold: int
+    ) -> None:
+        self._database = database
+        self._logger = logger
+        self._slow_query_threshold = slow_query_threshold
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._database, name)
+
+    @asynccontextmanager
+    async def _acquire(self) -> AsyncIterator[Any]:
+        started = time.perf_counter()
+        async with self._database.connection() as connection:
+            pool_wait.observe(time.perf_counter() - started)
+            yield connection
+
+    @contextmanager
+    def _observe(self, query: Query) -> Iterator[None]:
+        name = current_stage.get() or query_name(query)
+
+        counter = queries_counter.get()
+        if counter is not None:
+            counter.count += 1
+
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            query_duration.labels(name).observe(elapsed)
+
+            if elapsed * 1000 > self._slow_query_threshold:
+                self._logger.warning(
+                    "Slow query",
+                    query=name,
+                    duration=round(elapsed * 1000, 1),
+                    sql=sql_template(query),
+                )
+
+    async def execute(self, query: Query, values: Dict = None) -> Any:
+        async with self._acquire() as connection:
+            with self._observe(query):
+                return await connection.execute(query, values)
+
+    async def execute_many(self, query: Query, values: List) -> None:
+        async with self._acquire() as connection:
+            with self._observe(query):
+                return await connection.execute_many(query, values)
+
+    async def fetch_all(self, query: Query, values: Dict = None) -> List:
+        async with self._acquire() as connection:
+            with self._observe(query):
+                return await connection.fetch_all(query, values)
+
+    async def fetch_one(self, query: Query, values: Dict = None) -> Any:
+        async with self._acquire() as connection:
+            with self._observe(query):
+                return await connection.fetch_one(query, values)
+
+    async def fetch_val(
+        self, query: Query, values: Dict = None, column: Any = 0
+    ) -> Any:
+        async with self._acquire() as connection:
+            with self._observe(query):
+                return await connection.fetch_val(query, values, column=column)
+
+    async def iterate(
+        self, query: Query, values: Dict = None
+    ) -> AsyncGenerator[Any, None]:
+        async with self._acquire() as connection:
+            with self._observe(query):
+                async for record in connection.iterate(query, values):
+                    yield record
+
+
+@web.middleware
+async def queries_middleware(
+    request: web.Request, handler: Callable[[web.Request], Awaitable]
+) -> web.StreamResponse:
+    counter = QueryCounter()
+    token = queries_counter.set(counter)
+    try:
+        return await handler(request)
+    finally:
+        queries_counter.reset(token)
+        request_queries.labels(route_name(request)).observe(counter.count)
+
+
+async def instrumentation_ctx(
+    app: web.Application,
+) -> AsyncGenerator[None, None]:
+    database = app["db"]
+    app["db"] = InstrumentedDatabase(
+        database,
+        logger=app["logger"],
+        slow_query_threshold=app["config"].monitor.slow_query_threshold,
+    )
+
+    yield
+
+    app["db"] = database
@@ -0,0 +1,24 @@
+"""Add sessions expires index
+
+Revision ID: 3f1c2e7b9d40
+Revises: a01d1258d7a7
+Create Date: 2026-10-18 10:12:31.418822
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "3f1c2e7b9d40"
+down_revision = "a01d1258d7a7"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        op.f("ix_sessions_expires"), "sessions", ["expires"], unique=False
+    )
+
+
+def downgrade():
+    op.drop_index(op.f("ix_sessions_expires"), table_name="sessions")
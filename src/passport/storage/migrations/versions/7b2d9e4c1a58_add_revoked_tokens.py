@@ -0,0 +1,42 @@
+"""Add revoked tokens
+
+Revision ID: 7b2d9e4c1a58
+Revises: 3f1c2e7b9d40
+Create Date: 2026-10-18 14:02:47.305118
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "7b2d9e4c1a58"
+down_revision = "3f1c2e7b9d40"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "revoked_tokens",
+        sa.Column("id", sa.BigInteger(), nullable=False),
+        sa.Column("jti", sa.String(length=32), nullable=False),
+        sa.Column("user", sa.Integer(), nullable=False),
+        sa.Column("expires", sa.DateTime(), nullable=False),
+        sa.Column("revoked_on", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["user"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("jti"),
+    )
+    op.create_index(
+        op.f("ix_revoked_tokens_expires"),
+        "revoked_tokens",
+        ["expires"],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index(
+        op.f("ix_revoked_tokens_expires"), table_name="revoked_tokens"
+    )
+    op.drop_table("revoked_tokens")
@@ -0,0 +1,29 @@
+"""Add users inactive index
+
+Revision ID: c4e81f0b6d27
+Revises: 7b2d9e4c1a58
+Create Date: 2026-10-18 16:40:09.551204
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "c4e81f0b6d27"
+down_revision = "7b2d9e4c1a58"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_users_inactive",
+        "users",
+        ["id"],
+        unique=False,
+        postgresql_where=sa.text("NOT is_active"),
+    )
+
+
+def downgrade():
+    op.drop_index("ix_users_inactive", table_name="users")
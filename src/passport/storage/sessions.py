@@ -1,18 +1,23 @@
 from datetime import datetime
 
 import sqlalchemy  # type: ignore
+from aiohttp_micro.exceptions import EntityNotFound  # type: ignore
 from aiohttp_storage.storage import metadata  # type: ignore
 from databases import Database
 
-from passport.domain import User
+from passport.domain import Session, User
 from passport.domain.storage.sessions import SessionRepo
+from passport.storage.users import users, UsersDBRepo
+from passport.timing import timed
 
 
 sessions = sqlalchemy.Table(
     "sessions",
     metadata,
     sqlalchemy.Column("key", sqlalchemy.String(44), primary_key=True),
-    sqlalchemy.Column("expires", sqlalchemy.DateTime, default=datetime.utcnow),
+    sqlalchemy.Column(
+        "expires", sqlalchemy.DateTime, default=datetime.utcnow, index=True
+    ),
     sqlalchemy.Column(
         "user",
         sqlalchemy.Integer,
@@ -25,22 +30,64 @@ sessions = sqlalchemy.Table(
 class SessionDBStorage(SessionRepo):
     def __init__(self, database: Database) -> None:
         self._database = database
+        self._users = UsersDBRepo(database=database)
 
+    @timed("storage.sessions.fetch")
     async def fetch(self, key: str) -> int:
-        query = sqlalchemy.select([sessions.c.user]).where(
-            sessions.c.key == key
+        query = (
+            sqlalchemy.select([sessions.c.user])
+            .where(sessions.c.key == key)
+            .where(sessions.c.expires > datetime.now())
         )
         user_key = await self._database.fetch_val(query)
 
         return user_key
 
+    @timed("storage.sessions.fetch_session")
+    async def fetch_session(self, key: str) -> Session:
+        source = self._users.get_source().join(
+            sessions, sessions.c.user == users.c.id
+        )
+        query = (
+            self._users.get_query(source)
+            .column(sessions.c.expires)
+            .where(sessions.c.key == key)
+            .where(sessions.c.expires > datetime.now())
+            .group_by(sessions.c.key)
+        )
+        row = await self._database.fetch_one(query)
+
+        if not row:
+            raise EntityNotFound()
+
+        return Session(
+            key=key, user=self._users._process_row(row), expires=row["expires"]
+        )
+
+    @timed("storage.sessions.add")
     async def add(self, user: User, key: str, expires: datetime) -> None:
         await self._database.execute(
             sessions.insert(),
             values={"key": key, "user": user.key, "expires": expires},
         )
 
+    @timed("storage.sessions.remove")
     async def remove(self, key: str) -> None:
         await self._database.execute(
             sessions.delete().where(sessions.c.key == key)
         )
+
+    @timed("storage.sessions.remove_expired")
+    async def remove_expired(self, now: datetime, limit: int) -> int:
+        expired = (
+            sqlalchemy.select([sessions.c.key])
+            .where(sessions.c.expires < now)
+            .limit(limit)
+        )
+        rows = await self._database.fetch_all(
+            sessions.delete()
+            .where(sessions.c.key.in_(expired))
+            .returning(sessions.c.key)
+        )
+
+        return len(rows)
@@ -0,0 +1,96 @@
+from datetime import datetime
+from typing import List, Tuple
+
+import sqlalchemy  # type: ignore
+from aiohttp_storage.storage import metadata  # type: ignore
+from databases import Database
+from sqlalchemy.dialects.postgresql import insert  # type: ignore
+
+from passport.domain.storage.tokens import RevokedTokensRepo
+from passport.storage.users import users
+from passport.timing import timed
+
+
+revoked_tokens = sqlalchemy.Table(
+    "revoked_tokens",
+    metadata,
+    sqlalchemy.Column("id", sqlalchemy.BigInteger, primary_key=True),
+    sqlalchemy.Column(
+        "jti", sqlalchemy.String(32), nullable=False, unique=True
+    ),
+    sqlalchemy.Column(
+        "user",
+        sqlalchemy.Integer,
+        sqlalchemy.ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    ),
+    sqlalchemy.Column(
+        "expires", sqlalchemy.DateTime, nullable=False, index=True
+    ),
+    sqlalchemy.Column(
+        "revoked_on", sqlalchemy.DateTime, default=datetime.utcnow
+    ),
+)
+
+
+class RevokedTokensDBRepo(RevokedTokensRepo):
+    def __init__(self, database: Database) -> None:
+        self._database = database
+
+    @timed("storage.tokens.add")
+    async def add(self, jti: str, user_key: int, expires: datetime) -> bool:
+        # Select the owner instead of inserting the key directly, so a token
+        # of a deleted user is not revoked rather than violating the FK.
+        owner = sqlalchemy.select(
+            [
+                users.c.id,
+                sqlalchemy.literal(jti, sqlalchemy.String),
+                sqlalchemy.literal(expires, sqlalchemy.DateTime),
+                sqlalchemy.literal(datetime.utcnow(), sqlalchemy.DateTime),
+            ]
+        ).where(users.c.id == user_key)
+        query = (
+            insert(revoked_tokens)
+            .from_select(["user", "jti", "expires", "revoked_on"], owner)
+            .on_conflict_do_nothing(index_elements=["jti"])
+            .returning(revoked_tokens.c.id)
+        )
+        key = await self._database.fetch_val(query)
+
+        return key is not None
+
+    @timed("storage.tokens.fetch_since")
+    async def fetch_since(
+        self, key: int, limit: int
+    ) -> List[Tuple[int, str, datetime]]:
+        query = (
+            sqlalchemy.select(
+                [
+                    revoked_tokens.c.id,
+                    revoked_tokens.c.jti,
+                    revoked_tokens.c.expires,
+                ]
+            )
+            .where(revoked_tokens.c.id > key)
+            .where(revoked_tokens.c.expires > datetime.utcnow())
+            .order_by(revoked_tokens.c.id)
+            .limit(limit)
+        )
+        rows = await self._database.fetch_all(query)
+
+        return [(row["id"], row["jti"], row["expires"]) for row in rows]
+
+    @timed("storage.tokens.remove_expired")
+    async def remove_expired(self, now: datetime, limit: int) -> int:
+        expired = (
+            sqlalchemy.select([revoked_tokens.c.id])
+            .where(revoked_tokens.c.expires < now)
+            .limit(limit)
+        )
+        rows = await self._database.fetch_all(
+            revoked_tokens.delete()
+            .where(revoked_tokens.c.id.in_(expired))
+            .returning(revoked_tokens.c.id)
+        )
+
+        return len(rows)
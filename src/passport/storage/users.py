@@ -1,14 +1,21 @@
 from datetime import datetime
+from typing import Dict, Iterable, List, Sequence, Set, Tuple
 
 import sqlalchemy  # type: ignore
-from aiohttp_micro.exceptions import EntityNotFound  # type: ignore
+from aiohttp_micro.exceptions import (  # type: ignore
+    EntityAlreadyExist,
+    EntityNotFound,
+)
 from aiohttp_storage.storage import metadata  # type: ignore
 from databases import Database
 from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert  # type: ignore
 from sqlalchemy.orm.query import Query  # type: ignore
+from sqlalchemy.sql.expression import Join  # type: ignore
 
 from passport.domain import Permission, User
 from passport.domain.storage.users import UsersRepo
+from passport.timing import timed
 
 
 users = sqlalchemy.Table(
@@ -29,6 +36,12 @@ users = sqlalchemy.Table(
     ),
 )
 
+sqlalchemy.Index(
+    "ix_users_inactive",
+    users.c.id,
+    postgresql_where=users.c.is_active == False,  # noqa: E712
+)
+
 permissions = sqlalchemy.Table(
     "permissions",
     metadata,
@@ -58,23 +71,94 @@ user_permissions = sqlalchemy.Table(
     ),
 )
 
+GRANT_PERMISSIONS = """
+INSERT INTO user_permissions (user_id, permission_id)
+SELECT users.id, permissions.id
+FROM unnest(CAST(:emails AS text[]), CAST(:names AS text[]))
+    AS grants(email, name)
+JOIN users ON users.email = grants.email
+JOIN permissions ON permissions.name = grants.name
+ON CONFLICT DO NOTHING
+RETURNING user_id
+"""
+
+REVOKE_PERMISSIONS = """
+DELETE FROM user_permissions
+USING unnest(CAST(:emails AS text[]), CAST(:names AS text[]))
+    AS revokes(email, name), users, permissions
+WHERE users.email = revokes.email
+    AND permissions.name = revokes.name
+    AND user_permissions.user_id = users.id
+    AND user_permissions.permission_id = permissions.id
+RETURNING user_permissions.user_id
+"""
+
+UPDATE_LAST_LOGIN = """
+UPDATE users SET last_login = logins.last_login
+FROM unnest(CAST(:keys AS integer[]), CAST(:timestamps AS timestamp[]))
+    AS logins(id, last_login)
+WHERE users.id = logins.id
+"""
+
 
 class UsersDBRepo(UsersRepo):
+    table = users
+
     def __init__(self, database: Database) -> None:
         self._database = database
 
-    def get_query(self) -> Query:
-        return sqlalchemy.select(
-            [users.c.id, users.c.email, users.c.password]
-        ).where(
-            users.c.is_active == True  # noqa: E712
+    def get_source(self) -> Join:
+        return users.outerjoin(
+            user_permissions, user_permissions.c.user_id == users.c.id
+        ).outerjoin(
+            permissions,
+            sqlalchemy.and_(
+                permissions.c.id == user_permissions.c.permission_id,
+                permissions.c.enabled == True,  # noqa: E712
+            ),
+        )
+
+    def get_query(self, source: Join = None) -> Query:
+        if source is None:
+            source = self.get_source()
+
+        granted = permissions.c.id.isnot(None)
+
+        return (
+            sqlalchemy.select(
+                [
+                    users.c.id,
+                    users.c.email,
+                    users.c.password,
+                    users.c.is_superuser,
+                    func.array_agg(permissions.c.id)
+                    .filter(granted)
+                    .label("permission_keys"),
+                    func.array_agg(permissions.c.name)
+                    .filter(granted)
+                    .label("permission_names"),
+                ]
+            )
+            .select_from(source)
+            .where(users.c.is_active == True)  # noqa: E712
+            .group_by(users.c.id)
         )
 
     def _process_row(self, row) -> User:
         return User(
-            key=row["id"], email=row["email"], password=row["password"]
+            key=row["id"],
+            email=row["email"],
+            password=row["password"],
+            is_superuser=bool(row["is_superuser"]),
+            permissions=[
+                Permission(key=key, name=name)  # type: ignore
+                for key, name in zip(
+                    row["permission_keys"] or [], row["permission_names"] or []
+                )
+            ],
         )  # type: ignore
 
+    @timed("storage.users.fetch_by_key")
     async def fetch_by_key(self, key: int) -> User:
         query = self.get_query().where(users.c.id == key)
         row = await self._database.fetch_one(query)
@@ -84,6 +168,7 @@ class UsersDBRepo(UsersRepo):
 
         return self._process_row(row)
 
+    @timed("storage.users.fetch_by_email")
     async def fetch_by_email(self, email: str) -> User:
         query = self.get_query().where(users.c.email == email)
         row = await self._database.fetch_one(query)
@@ -93,6 +178,16 @@ class UsersDBRepo(UsersRepo):
 
         return self._process_row(row)
 
+    @timed("storage.users.fetch_inactive_keys")
+    async def fetch_inactive_keys(self) -> Set[int]:
+        query = sqlalchemy.select([users.c.id]).where(
+            users.c.is_active == False  # noqa: E712
+        )
+        rows = await self._database.fetch_all(query)
+
+        return {row["id"] for row in rows}
+
+    @timed("storage.users.exists")
     async def exists(self, email: str) -> bool:
         query = sqlalchemy.select([func.count(users.c.id)]).where(
             users.c.email == email
@@ -101,9 +196,12 @@ class UsersDBRepo(UsersRepo):
 
         return count > 0
 
+    @timed("storage.users.add")
     async def add(self, user: User) -> None:
         key = await self._database.execute(
-            users.insert().returning(users.c.id),
+            insert(users)
+            .on_conflict_do_nothing(index_elements=[users.c.email])
+            .returning(users.c.id),
             values={
                 "email": user.email,
                 "password": user.password,
@@ -112,6 +210,9 @@ class UsersDBRepo(UsersRepo):
             },
         )
 
+        if not key:
+            raise EntityAlreadyExist()
+
         if user.permissions:
             await self._database.execute_many(
                 user_permissions.insert(),
@@ -123,10 +224,87 @@ class UsersDBRepo(UsersRepo):
 
         user.key = key
 
+    @timed("storage.users.add_many")
+    async def add_many(self, users: Sequence[User]) -> int:
+        if not users:
+            return 0
+
+        now = datetime.now()
+        query = (
+            insert(self.table)
+            .values(
+                [
+                    {
+                        "email": user.email,
+                        "password": user.password,
+                        "is_active": True,
+                        "created_on": now,
+                    }
+                    for user in users
+                ]
+            )
+            .on_conflict_do_nothing(index_elements=[self.table.c.email])
+            .returning(self.table.c.id)
+        )
+        rows = await self._database.fetch_all(query)
+
+        return len(rows)
+
+    @timed("storage.users.update_last_login")
+    async def update_last_login(self, logins: Dict[int, datetime]) -> None:
+        if not logins:
+            return
+
+        await self._database.execute(
+            UPDATE_LAST_LOGIN,
+            values={
+                "keys": list(logins.keys()),
+                "timestamps": list(logins.values()),
+            },
+        )
+
     async def add_permission(self, user: User, permission: Permission) -> None:
-        raise NotImplementedError()
+        await self.add_permissions([(user.email, permission.name)])
 
     async def remove_permission(
         self, user: User, permission: Permission
     ) -> None:
-        raise NotImplementedError()
+        await self.remove_permissions([(user.email, permission.name)])
+
+    @timed("storage.users.add_permissions")
+    async def add_permissions(self, grants: Iterable[Tuple[str, str]]) -> int:
+        emails, names = self._unzip_grants(grants)
+        if not emails:
+            return 0
+
+        rows = await self._database.fetch_all(
+            GRANT_PERMISSIONS, values={"emails": emails, "names": names}
+        )
+
+        return len(rows)
+
+    @timed("storage.users.remove_permissions")
+    async def remove_permissions(
+        self, grants: Iterable[Tuple[str, str]]
+    ) -> int:
+        emails, names = self._unzip_grants(grants)
+        if not emails:
+            return 0
+
+        rows = await self._database.fetch_all(
+            REVOKE_PERMISSIONS, values={"emails": emails, "names": names}
+        )
+
+        return len(rows)
+
+    def _unzip_grants(
+        self, grants: Iterable[Tuple[str, str]]
+    ) -> Tuple[List[str], List[str]]:
+        emails: List[str] = []
+        names: List[str] = []
+
+        for email, name in grants:
+            emails.append(email)
+            names.append(name)
+
+        return emails, names
@@ -0,0 +1,77 @@
+import functools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Iterator, List, Optional, Tuple
+
+from aiohttp import web
+
+from passport.metrics import stage_duration
+
+
+Timings = List[Tuple[str, float]]
+
+request_timings: ContextVar[Optional[Timings]] = ContextVar(
+    "request_timings", default=None
+)
+current_stage: ContextVar[Optional[str]] = ContextVar(
+    "current_stage", default=None
+)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    token = current_stage.set(name)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        current_stage.reset(token)
+        stage_duration.labels(name).observe(elapsed)
+
+        timings = request_timings.get()
+        if timings is not None:
+            timings.append((name, elapsed))
+
+
+def timed(name: str):
+    def wrapper(f):
+        @functools.wraps(f)
+        async def wrapped(*args, **kwargs):
+            with stage(name):
+                return await f(*args, **kwargs)
+
+        return wrapped
+
+    return wrapper
+
+
+def server_timing(timings: Timings) -> str:
+    return ", ".join(
+        f"{name};dur={elapsed * 1000:.1f}" for name, elapsed in timings
+    )
+
+
+@web.middleware
+async def server_timing_middleware(
+    request: web.Request, handler: Callable[[web.Request], Awaitable]
+) -> web.StreamResponse:
+    if not request.app["config"].monitor.server_timing:
+        return await handler(request)
+
+    timings: Timings = []
+    token = request_timings.set(timings)
+    try:
+        response = await handler(request)
+    except web.HTTPException as exc:
+        if timings:
+            exc.headers["Server-Timing"] = server_timing(timings)
+        raise
+    finally:
+        request_timings.reset(token)
+
+    if timings and not response.prepared:
+        response.headers["Server-Timing"] = server_timing(timings)
+
+    return response
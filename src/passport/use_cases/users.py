@@ -1,6 +1,7 @@
 from passport.domain import User
 from passport.services.users import UserService
 from passport.storage import DBStorage
+from passport.timing import stage
 from passport.use_cases import UseCase
 
 
@@ -8,8 +9,11 @@ class LoginUseCase(UseCase):
     async def execute(self, email: str, password: str) -> User:
         storage = DBStorage(self.app["db"])
 
-        service = UserService(storage)
-        user = await service.login(email, password)
+        service = UserService(storage, self.app["passwords"])
+        with stage("users.login"):
+            user = await service.login(email, password)
+
+        self.app["last_login"].record(user)
 
         return user
 
@@ -18,7 +22,7 @@ class RegisterUserUseCase(UseCase):
     async def execute(self, email: str, password: str) -> User:
         storage = DBStorage(self.app["db"])
 
-        service = UserService(storage)
+        service = UserService(storage, self.app["passwords"])
         user = await service.register(email, password)
 
         return user
@@ -1,3 +1,4 @@
+import time
 from datetime import datetime, timedelta
 from typing import Dict
 
@@ -8,6 +9,7 @@ from passlib.handlers.pbkdf2 import pbkdf2_sha512  # type: ignore
 
 from passport.domain import TokenType, User
 from passport.services.tokens import TokenGenerator
+from passport.storage import DBStorage
 from passport.storage.users import users as users_table
 
 
@@ -218,6 +220,7 @@ async def test_refresh_failed_for_inactive(aiohttp_client, app, prepare_user):
         },
         app,
     )
+    await app["inactive_users"].reload(DBStorage(app["db"]))
 
     generator = TokenGenerator(private_key=app["config"].tokens.private_key)
     refresh_token = generator.generate(
@@ -229,3 +232,159 @@ async def test_refresh_failed_for_inactive(aiohttp_client, app, prepare_user):
     headers = {"X-REFRESH-TOKEN": refresh_token}
     resp = await client.post(url, headers=headers)
     assert resp.status == 403
+
+
+@pytest.mark.integration
+async def test_refresh_reuses_fresh_claims(aiohttp_client, app, prepare_user):
+    client = await aiohttp_client(app)
+    url = app.router.named_resources()["api.tokens.refresh"].url_for()
+
+    user = await prepare_user(
+        {"email": "john@testing.com", "password": "top-secret"}, app
+    )
+    await app["inactive_users"].reload(DBStorage(app["db"]))
+
+    await app["db"].execute(
+        users_table.update()
+        .where(users_table.c.id == user.key)
+        .values(email="jane@testing.com")
+    )
+
+    generator = TokenGenerator(private_key=app["config"].tokens.private_key)
+    refresh_token = generator.generate(
+        user,
+        token_type=TokenType.refresh,
+        expire=app["config"].tokens.refresh_token_expire,
+    )
+
+    resp = await client.post(url, headers={"X-REFRESH-TOKEN": refresh_token})
+    assert resp.status == 200
+
+    result = await resp.json()
+    assert result["user"]["email"] == "john@testing.com"
+
+    stale_token = generator.generate(
+        user,
+        token_type=TokenType.refresh,
+        expire=app["config"].tokens.refresh_token_expire,
+        claims_at=int(time.time())
+        - app["config"].users.refresh_claims_max_age
+        - 1,
+    )
+
+    resp = await client.post(url, headers={"X-REFRESH-TOKEN": stale_token})
+    assert resp.status == 200
+
+    result = await resp.json()
+    assert result["user"]["email"] == "jane@testing.com"
+
+
+@pytest.mark.integration
+async def test_refresh_failed_for_deleted(aiohttp_client, app, prepare_user):
+    client = await aiohttp_client(app)
+    url = app.router.named_resources()["api.tokens.refresh"].url_for()
+
+    user = await prepare_user(
+        {"email": "john@testing.com", "password": "top-secret"}, app
+    )
+    await app["inactive_users"].reload(DBStorage(app["db"]))
+
+    generator = TokenGenerator(private_key=app["config"].tokens.private_key)
+    refresh_token = generator.generate(
+        user,
+        token_type=TokenType.refresh,
+        expire=app["config"].tokens.refresh_token_expire,
+    )
+
+    await app["db"].execute(
+        users_table.delete().where(users_table.c.id == user.key)
+    )
+
+    resp = await client.post(url, headers={"X-REFRESH-TOKEN": refresh_token})
+    assert resp.status == 403
+
+
+@pytest.mark.integration
+async def test_refresh_token_rotation(aiohttp_client, app, prepare_user):
+    client = await aiohttp_client(app)
+    url = app.router.named_resources()["api.tokens.refresh"].url_for()
+
+    user = await prepare_user(
+        {"email": "john@testing.com", "password": "top-secret"}, app
+    )
+
+    generator = TokenGenerator(private_key=app["config"].tokens.private_key)
+    refresh_token = generator.generate(
+        user,
+        token_type=TokenType.refresh,
+        expire=app["config"].tokens.refresh_token_expire,
+    )
+
+    resp = await client.post(url, headers={"X-REFRESH-TOKEN": refresh_token})
+    assert resp.status == 200
+    assert resp.headers["X-REFRESH-TOKEN"] != refresh_token
+
+    rotated_token = resp.headers["X-REFRESH-TOKEN"]
+
+    resp = await client.post(url, headers={"X-REFRESH-TOKEN": refresh_token})
+    assert resp.status == 403
+
+    resp = await client.post(url, headers={"X-REFRESH-TOKEN": rotated_token})
+    assert resp.status == 200
+
+
+@pytest.mark.integration
+async def test_refresh_legacy_token_single_use(
+    aiohttp_client, app, prepare_user
+):
+    client = await aiohttp_client(app)
+    url = app.router.named_resources()["api.tokens.refresh"].url_for()
+
+    user = await prepare_user(
+        {"email": "john@testing.com", "password": "top-secret"}, app
+    )
+
+    now = datetime.utcnow()
+
+    refresh_token = jwt.encode(
+        {
+            "user": {"id": user.key, "email": user.email},
+            "token_type": TokenType.refresh.value,
+            "iss": "urn:passport",
+            "exp": now
+            + timedelta(seconds=app["config"].tokens.refresh_token_expire),
+            "iat": now,
+        },
+        app["config"].tokens.private_key,
+        algorithm="RS256",
+    ).decode("utf-8")
+
+    resp = await client.post(url, headers={"X-REFRESH-TOKEN": refresh_token})
+    assert resp.status == 200
+
+    resp = await client.post(url, headers={"X-REFRESH-TOKEN": refresh_token})
+    assert resp.status == 403
+
+
+@pytest.mark.integration
+async def test_introspect_tokens(aiohttp_client, app):
+    client = await aiohttp_client(app)
+    url = app.router.named_resources()["api.tokens.introspect"].url_for()
+
+    user = User(key=1, email="john@testing.com")  # type: ignore
+
+    generator = TokenGenerator(private_key=app["config"].tokens.private_key)
+    access_token = generator.generate(user, expire=60)
+    expired_token = generator.generate(user, expire=-60)
+
+    data = {"tokens": [access_token, expired_token, "malformed"]}
+    resp = await client.post(url, **prepare_request(data, json=True))
+    assert resp.status == 200
+
+    result = await resp.json()
+    assert result["tokens"][0]["active"]
+    assert result["tokens"][0]["user"]["email"] == user.email
+    assert result["tokens"][1:] == [
+        {"active": False, "error": "expired"},
+        {"active": False, "error": "invalid"},
+    ]
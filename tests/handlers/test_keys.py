@@ -0,0 +1,32 @@
+import pytest  # type: ignore
+
+
+@pytest.mark.integration
+async def test_jwks(aiohttp_client, app):
+    client = await aiohttp_client(app)
+    url = app.router.named_resources()["api.jwks"].url_for()
+
+    resp = await client.get(url)
+    assert resp.status == 200
+    assert "max-age" in resp.headers["Cache-Control"]
+
+    data = await resp.json()
+    kid = app["token_generator"].kid
+    assert [key["kid"] for key in data["keys"]] == [kid]
+
+    resp = await client.get(
+        url, headers={"If-None-Match": resp.headers["ETag"]}
+    )
+    assert resp.status == 304
+
+
+@pytest.mark.integration
+async def test_public_key(aiohttp_client, app):
+    client = await aiohttp_client(app)
+    url = app.router.named_resources()["api.keys"].url_for()
+
+    resp = await client.get(url)
+    assert resp.status == 200
+
+    data = await resp.json()
+    assert data["public"] == app["config"].tokens.public_key
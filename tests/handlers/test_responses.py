@@ -0,0 +1,19 @@
+import json
+
+import pytest  # type: ignore
+
+from passport.domain import User
+from passport.handlers import json_response, user_response_schema
+
+
+@pytest.mark.unit
+def test_json_response():
+    user = User(key=1, email="john@testing.com")  # type: ignore
+
+    data = user_response_schema.dump({"user": user})
+    response = json_response(data, status=201, headers={"X-TEST": "test"})
+
+    assert response.status == 201
+    assert response.content_type == "application/json"
+    assert response.headers["X-TEST"] == "test"
+    assert json.loads(response.body) == data
@@ -0,0 +1,36 @@
+import io
+
+import pytest  # type: ignore
+
+from passport.management.permissions import read_grants
+
+
+@pytest.mark.unit
+def test_read_grants():
+    source = io.StringIO(
+        "email,permission\n"
+        "# comment\n"
+        "john@testing.com, read\n"
+        "\n"
+        "jane@testing.com,write\n"
+    )
+
+    assert list(read_grants(source)) == [
+        ("john@testing.com", "read"),
+        ("jane@testing.com", "write"),
+    ]
+
+
+@pytest.mark.unit
+def test_read_grants_skips_malformed_rows(capsys):
+    source = io.StringIO(
+        "john@testing.com\n"
+        "jane@testing.com,\n"
+        "joe@testing.com,read\n"
+    )
+
+    assert list(read_grants(source)) == [("joe@testing.com", "read")]
+
+    errors = capsys.readouterr().err
+    assert "Skip malformed row 1" in errors
+    assert "Skip malformed row 2" in errors
@@ -0,0 +1,83 @@
+import io
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest  # type: ignore
+
+from passport.domain import hash_password, verify_password
+from passport.management.users import (
+    prepare_users,
+    read_checkpoint,
+    read_records,
+    write_checkpoint,
+)
+
+
+@pytest.mark.unit
+def test_read_csv_records():
+    source = io.StringIO(
+        "email,password\n"
+        "john@testing.com,top-secret\n"
+        "jane@testing.com,secret\n"
+    )
+
+    assert list(read_records(source, "csv")) == [
+        {"email": "john@testing.com", "password": "top-secret"},
+        {"email": "jane@testing.com", "password": "secret"},
+    ]
+
+
+@pytest.mark.unit
+def test_read_jsonl_records(capsys):
+    source = io.StringIO(
+        '{"email": "john@testing.com", "password": "top-secret"}\n'
+        "\n"
+        "{broken\n"
+        '["jane@testing.com"]\n'
+        '{"email": "jane@testing.com", "password": "secret"}\n'
+    )
+
+    assert list(read_records(source, "jsonl")) == [
+        {"email": "john@testing.com", "password": "top-secret"},
+        {"email": "jane@testing.com", "password": "secret"},
+    ]
+
+    errors = capsys.readouterr().err
+    assert "Skip malformed line 3" in errors
+    assert "Skip malformed line 4" in errors
+
+
+@pytest.mark.unit
+async def test_prepare_users(capsys):
+    password_hash = hash_password("secret", rounds=1000)
+    records = [
+        {"email": " john@testing.com ", "password": "top-secret"},
+        {"email": "jane@testing.com", "password": password_hash},
+        {"email": "joe@testing.com"},
+        {"password": "top-secret"},
+        {"email": "jack@testing.com", "password": None},
+    ]
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        users = await prepare_users(records, executor, rounds=1000)
+
+    assert [user.email for user in users] == [
+        "john@testing.com",
+        "jane@testing.com",
+    ]
+    assert verify_password("top-secret", users[0].password)
+    assert users[1].password == password_hash
+
+    errors = capsys.readouterr().err
+    assert "Skip record without password: joe@testing.com" in errors
+    assert "Skip record without email" in errors
+    assert "Skip record without password: jack@testing.com" in errors
+
+
+@pytest.mark.unit
+def test_checkpoint(tmp_path):
+    path = str(tmp_path / "import.checkpoint")
+
+    assert read_checkpoint(path) == 0
+
+    write_checkpoint(path, 5000)
+    assert read_checkpoint(path) == 5000
@@ -0,0 +1,108 @@
+import jwt
+import pytest  # type: ignore
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+
+from passport.domain import User
+from passport.exceptions import BadToken
+from passport.services.keys import (
+    from_jwk,
+    key_id,
+    KeySet,
+    load_public_key,
+    load_public_keys,
+)
+from passport.services.tokens import TokenDecoder, TokenGenerator
+
+
+@pytest.mark.unit
+def test_rsa_jwks(config):
+    public_key = load_public_key(config.tokens.public_key)
+
+    jwks = KeySet([public_key]).jwks()
+
+    assert len(jwks["keys"]) == 1
+    assert jwks["keys"][0]["kty"] == "RSA"
+    assert jwks["keys"][0]["e"] == "AQAB"
+
+
+@pytest.mark.unit
+def test_token_kid(config):
+    generator = TokenGenerator(private_key=config.tokens.private_key)
+    decoder = TokenDecoder(public_key=config.tokens.public_key)
+
+    user = User(key=1, email="john@testing.com")  # type: ignore
+    token = generator.generate(user)
+
+    assert jwt.get_unverified_header(token)["kid"] == generator.kid
+    assert generator.kid in decoder.keys
+
+
+@pytest.mark.unit
+def test_decode_unknown_kid(config):
+    generator = TokenGenerator(private_key=config.tokens.private_key)
+    other_key = ec.generate_private_key(ec.SECP256R1(), default_backend())
+    decoder = TokenDecoder(public_key=other_key.public_key())
+
+    user = User(key=1, email="john@testing.com")  # type: ignore
+    token = generator.generate(user)
+
+    with pytest.raises(BadToken):
+        decoder.decode(token)
+
+
+@pytest.mark.unit
+def test_load_multiple_public_keys(config):
+    keys = load_public_keys(
+        "\n".join([config.tokens.public_key, config.tokens.public_key])
+    )
+
+    assert len(keys) == 2
+
+
+def generate_key(algorithm):
+    if algorithm == "RS256":
+        return rsa.generate_private_key(65537, 2048, default_backend())
+    elif algorithm == "ES256":
+        return ec.generate_private_key(ec.SECP256R1(), default_backend())
+
+    return ed25519.Ed25519PrivateKey.generate()
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("algorithm", ["RS256", "ES256", "EdDSA"])
+def test_signing_algorithms(algorithm):
+    private_key = generate_key(algorithm)
+    generator = TokenGenerator(private_key=private_key, algorithm=algorithm)
+    decoder = TokenDecoder(public_key=private_key.public_key())
+
+    user = User(key=1, email="john@testing.com")  # type: ignore
+    token = generator.generate(user)
+
+    assert jwt.get_unverified_header(token)["alg"] == algorithm
+    assert decoder.decode(token).key == 1
+
+    jwk = KeySet([private_key.public_key()]).jwks()["keys"][0]
+    assert key_id(from_jwk(jwk)) == jwk["kid"]
+    assert jwk["alg"] == algorithm
+
+
+@pytest.mark.unit
+def test_decode_not_accepted_algorithm():
+    private_key = generate_key("EdDSA")
+    generator = TokenGenerator(private_key=private_key)
+    decoder = TokenDecoder(
+        public_key=private_key.public_key(), algorithms=["RS256"]
+    )
+
+    user = User(key=1, email="john@testing.com")  # type: ignore
+    token = generator.generate(user)
+
+    with pytest.raises(BadToken):
+        decoder.decode(token)
+
+
+@pytest.mark.unit
+def test_generator_algorithm_mismatch():
+    with pytest.raises(ValueError):
+        TokenGenerator(private_key=generate_key("ES256"), algorithm="RS256")
@@ -0,0 +1,52 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest  # type: ignore
+
+from passport.domain import hash_password
+from passport.exceptions import Overloaded
+from passport.services.passwords import PasswordHasher
+
+
+@pytest.fixture(scope="function")
+def executor():
+    executor = ThreadPoolExecutor(max_workers=1)
+
+    yield executor
+
+    executor.shutdown(wait=True)
+
+
+@pytest.mark.unit
+async def test_hash_password(executor):
+    hasher = PasswordHasher(executor, max_pending=1, rounds=1000)
+
+    password_hash = await hasher.hash("top-secret")
+
+    assert password_hash.startswith("$pbkdf2-sha512$1000$")
+    assert await hasher.verify("top-secret", password_hash)
+    assert hasher.pending == 0
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("password", ["", "wrong-password"])
+async def test_verify_password_failed(executor, password):
+    hasher = PasswordHasher(executor, max_pending=1)
+
+    valid = await hasher.verify(password, hash_password("top-secret"))
+
+    assert not valid
+
+
+@pytest.mark.unit
+async def test_verify_password_without_hash(executor):
+    hasher = PasswordHasher(executor, max_pending=1)
+
+    assert not await hasher.verify("top-secret", None)
+
+
+@pytest.mark.unit
+async def test_hasher_overloaded(executor):
+    hasher = PasswordHasher(executor, max_pending=0)
+
+    with pytest.raises(Overloaded):
+        await hasher.hash("top-secret")
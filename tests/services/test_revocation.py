@@ -0,0 +1,94 @@
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+
+import pytest  # type: ignore
+
+from passport.services.revocation import RevocationIndex, RevocationService
+
+
+class FakeRevokedTokens:
+    def __init__(self) -> None:
+        self.tokens: Dict[str, Tuple[int, datetime]] = {}
+
+    async def add(self, jti: str, user_key: int, expires: datetime) -> bool:
+        if jti in self.tokens:
+            return False
+
+        self.tokens[jti] = (len(self.tokens) + 1, expires)
+        return True
+
+    async def fetch_since(
+        self, key: int, limit: int
+    ) -> List[Tuple[int, str, datetime]]:
+        rows = sorted(
+            (index, jti, expires)
+            for jti, (index, expires) in self.tokens.items()
+            if index > key
+        )
+        return rows[:limit]
+
+    async def remove_expired(self, now: datetime, limit: int) -> int:
+        return 0
+
+
+class FakeStorage:
+    def __init__(self) -> None:
+        self.tokens = FakeRevokedTokens()
+
+
+@pytest.fixture(scope="function")
+def storage():
+    return FakeStorage()
+
+
+@pytest.mark.unit
+async def test_revoke_token_once(storage):
+    service = RevocationService(storage, RevocationIndex())
+    expires = datetime.utcnow() + timedelta(hours=1)
+
+    assert await service.revoke("token", 1, expires)
+    assert service.is_revoked("token")
+    assert not await service.revoke("token", 1, expires)
+
+
+@pytest.mark.unit
+async def test_sync_revoked_tokens_incrementally(storage):
+    expires = datetime.utcnow() + timedelta(hours=1)
+    writer = RevocationService(storage, RevocationIndex())
+    reader = RevocationService(storage, RevocationIndex())
+
+    for index in range(5):
+        await writer.revoke(f"token-{index}", 1, expires)
+
+    assert await reader.sync(batch_size=2) == 5
+    assert reader.is_revoked("token-4")
+
+    await writer.revoke("token-5", 1, expires)
+
+    assert await reader.sync(batch_size=2) == 1
+    assert reader.is_revoked("token-5")
+
+
+@pytest.mark.unit
+def test_prune_expired_revocations():
+    now = datetime.utcnow()
+
+    index = RevocationIndex()
+    index.add("expired", now - timedelta(seconds=1))
+    index.add("active", now + timedelta(hours=1))
+
+    assert index.prune(now) == 1
+    assert "expired" not in index
+    assert "active" in index
+
+
+@pytest.mark.unit
+def test_prune_keeps_readded_revocations():
+    now = datetime.utcnow()
+
+    index = RevocationIndex()
+    index.add("token", now - timedelta(seconds=1))
+    index.add("token", now + timedelta(hours=1))
+
+    assert index.prune(now) == 0
+    assert "token" in index
@@ -0,0 +1,112 @@
+import time
+from datetime import datetime, timedelta
+from typing import Dict
+
+import pytest  # type: ignore
+from aiohttp_micro.exceptions import EntityNotFound  # type: ignore
+
+from passport.cache import MemoryCacheBackend
+from passport.domain import Session, User
+from passport.services.sessions import SessionService
+
+
+class FakeSessions:
+    def __init__(self, users: Dict[int, User]) -> None:
+        self.sessions: Dict[str, Session] = {}
+        self.users = users
+        self.fetched = 0
+
+    async def fetch_session(self, key: str) -> Session:
+        self.fetched += 1
+        session = self.sessions.get(key, None)
+        if not session or session.expires <= datetime.now():
+            raise EntityNotFound()
+        return session
+
+    async def add(self, user: User, key: str, expires: datetime) -> None:
+        self.sessions[key] = Session(
+            key=key, user=self.users[user.key], expires=expires
+        )
+
+    async def remove(self, key: str) -> None:
+        self.sessions.pop(key, None)
+
+    async def remove_expired(self, now: datetime, limit: int) -> int:
+        expired = [key for key in self.sessions if key.startswith("expired")]
+        for key in expired[:limit]:
+            del self.sessions[key]
+        return len(expired[:limit])
+
+
+class FakeStorage:
+    def __init__(self, *users: User) -> None:
+        self.sessions = FakeSessions({user.key: user for user in users})
+
+
+@pytest.fixture(scope="function")
+def user():
+    return User(key=1, email="john@testing.com")  # type: ignore
+
+
+@pytest.fixture(scope="function")
+def service(user):
+    return SessionService(
+        FakeStorage(user), MemoryCacheBackend(maxsize=10, ttl=60)
+    )
+
+
+@pytest.mark.unit
+async def test_fetch_session_cached(service, user):
+    expires = datetime.now() + timedelta(days=1)
+    await service.add(user, "session-key", expires)
+
+    assert await service.fetch("session-key") == user
+    assert await service.fetch("session-key") == user
+    assert service.storage.sessions.fetched == 1
+
+
+@pytest.mark.unit
+async def test_fetch_removed_session(service, user):
+    expires = datetime.now() + timedelta(days=1)
+    await service.add(user, "session-key", expires)
+    await service.fetch("session-key")
+
+    await service.remove("session-key")
+
+    with pytest.raises(EntityNotFound):
+        await service.fetch("session-key")
+
+
+@pytest.mark.unit
+async def test_fetch_expired_session(service, user):
+    expires = datetime.now() - timedelta(seconds=1)
+    await service.add(user, "session-key", expires)
+
+    with pytest.raises(EntityNotFound):
+        await service.fetch("session-key")
+
+
+@pytest.mark.unit
+async def test_session_cache_bounded_by_expiry(service, user):
+    expires = datetime.now() + timedelta(seconds=30)
+    await service.add(user, "session-key", expires)
+
+    await service.fetch("session-key")
+
+    _, cached_until = service.cache.cache._entries[
+        service._cache_key("session-key")
+    ]
+    assert cached_until - time.monotonic() <= 30
+
+
+@pytest.mark.unit
+async def test_remove_expired_in_batches(service, user):
+    expires = datetime.now() + timedelta(days=1)
+    await service.add(user, "session-key", expires)
+    for index in range(5):
+        await service.add(user, f"expired-{index}", expires)
+
+    removed = await service.remove_expired(batch_size=2)
+
+    assert removed == 5
+    assert list(service.storage.sessions.sessions.keys()) == ["session-key"]
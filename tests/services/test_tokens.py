@@ -0,0 +1,168 @@
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest  # type: ignore
+
+from passport.cache import TTLCache
+from passport.domain import Permission, TokenType, User
+from passport.exceptions import BadToken, TokenExpired
+from passport.services.tokens import (
+    CachedTokenDecoder,
+    TokenDecoder,
+    TokenGenerator,
+)
+
+
+@pytest.fixture(scope="module")
+def generator(config):
+    return TokenGenerator(private_key=config.tokens.private_key)
+
+
+@pytest.fixture(scope="module")
+def decoder(config):
+    return TokenDecoder(public_key=config.tokens.public_key)
+
+
+@pytest.mark.unit
+def test_decode_token(generator, decoder):
+    user = User(key=1, email="john@testing.com")  # type: ignore
+
+    token = generator.generate(user, expire=60)
+
+    decoded = decoder.decode(token)
+    assert decoded.key == user.key
+    assert decoded.email == user.email
+
+
+@pytest.mark.unit
+def test_decode_token_with_permissions(generator, decoder):
+    user = User(  # type: ignore
+        key=1,
+        email="john@testing.com",
+        permissions=[Permission(key=1, name="read")],  # type: ignore
+    )
+
+    token = generator.generate(user, expire=60)
+
+    decoded = decoder.decode(token)
+    assert [permission.name for permission in decoded.permissions] == ["read"]
+
+
+@pytest.mark.unit
+def test_decode_token_with_wrong_type(generator, decoder):
+    user = User(key=1, email="john@testing.com")  # type: ignore
+
+    token = generator.generate(user, token_type=TokenType.refresh, expire=60)
+
+    with pytest.raises(BadToken):
+        decoder.decode(token)
+
+
+@pytest.mark.unit
+def test_cached_decoder(generator, decoder):
+    cached = CachedTokenDecoder(decoder, cache=TTLCache(maxsize=10, ttl=60))
+    user = User(key=1, email="john@testing.com")  # type: ignore
+
+    token = generator.generate(user, expire=60)
+
+    assert cached.decode(token).key == user.key
+    assert cached.decode(token).key == user.key
+    assert cached.cache.hits == 1
+    assert cached.cache.misses == 1
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("workers", [0, 2])
+def test_decode_many(generator, decoder, workers):
+    user = User(key=1, email="john@testing.com")  # type: ignore
+
+    valid = generator.generate(user, expire=60)
+    expired = generator.generate(user, expire=-60)
+    tokens = [valid, "malformed", expired, valid]
+
+    if workers:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = decoder.decode_many(tokens, executor=executor)
+    else:
+        results = decoder.decode_many(tokens)
+
+    assert [result.token for result in results] == tokens
+    assert results[0].user.key == user.key
+    assert results[0].error is None
+    assert results[0] is results[3]
+    assert isinstance(results[1].error, BadToken)
+    assert isinstance(results[2].error, TokenExpired)
+
+
+@pytest.mark.unit
+def test_cached_decoder_decode_many(generator, decoder):
+    cached = CachedTokenDecoder(decoder, cache=TTLCache(maxsize=10, ttl=60))
+    user = User(key=1, email="john@testing.com")  # type: ignore
+
+    token = generator.generate(user, expire=60)
+    expired = generator.generate(user, expire=-60)
+
+    results = cached.decode_many([token, expired, token])
+    assert results[0].user.key == user.key
+    assert isinstance(results[1].error, TokenExpired)
+    assert results[2] is results[0]
+    assert len(cached.cache) == 1
+
+    assert cached.decode_many([token])[0].user.key == user.key
+    assert cached.cache.hits == 1
+
+
+@pytest.mark.unit
+def test_refresh_token_has_unique_id(generator, decoder):
+    user = User(key=1, email="john@testing.com")  # type: ignore
+
+    first, second = (
+        decoder.decode_payload(
+            generator.generate(user, token_type=TokenType.refresh, expire=60)
+        )
+        for _ in range(2)
+    )
+
+    assert first["jti"] != second["jti"]
+    assert "jti" not in decoder.decode_payload(generator.generate(user))
+
+
+@pytest.mark.unit
+def test_refresh_token_keeps_claims_timestamp(generator, decoder):
+    user = User(key=1, email="john@testing.com")  # type: ignore
+
+    token = generator.generate(
+        user, token_type=TokenType.refresh, expire=60, claims_at=1000
+    )
+
+    assert decoder.decode_payload(token)["claims_at"] == 1000
+
+
+@pytest.mark.unit
+def test_decode_many_malformed_token_with_shared_header(generator, decoder):
+    user = User(key=1, email="john@testing.com")  # type: ignore
+
+    valid = generator.generate(user, expire=60)
+    truncated = valid.split(".")[0] + ".abc"
+
+    results = decoder.decode_many([truncated, valid])
+
+    assert isinstance(results[0].error, BadToken)
+    assert results[1].error is None
+    assert results[1].user.key == user.key
+
+
+@pytest.mark.unit
+def test_decode_token_signed_with_not_accepted_algorithm(config, generator):
+    decoder = TokenDecoder(
+        public_key=config.tokens.public_key, algorithms=("ES256",)
+    )
+    user = User(key=1, email="john@testing.com")  # type: ignore
+
+    token = generator.generate(user, expire=60)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+
+        with pytest.raises(BadToken):
+            decoder.decode_payload(token)
@@ -0,0 +1,156 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Set
+
+import pytest  # type: ignore
+from aiohttp_micro.exceptions import EntityAlreadyExist  # type: ignore
+
+from passport.domain import User
+from passport.exceptions import Overloaded
+from passport.services.passwords import PasswordHasher
+from passport.services.users import (
+    InactiveUsers,
+    LastLoginRecorder,
+    UserService,
+)
+
+
+class FakeUsers:
+    def __init__(self) -> None:
+        self.users: Dict[str, Dict] = {}
+        self.logins: Dict[int, datetime] = {}
+        self.failed = False
+
+    async def add(self, user: User) -> None:
+        if user.email in self.users:
+            raise EntityAlreadyExist()
+
+        user.key = len(self.users) + 1
+        self.users[user.email] = {
+            "key": user.key,
+            "password": user.password,
+            "is_active": True,
+        }
+
+    async def fetch_inactive_keys(self) -> Set[int]:
+        return {
+            user["key"] for user in self.users.values() if not user["is_active"]
+        }
+
+    async def update_last_login(self, logins: Dict[int, datetime]) -> None:
+        if self.failed:
+            raise ConnectionError()
+        self.logins.update(logins)
+
+
+class FakeStorage:
+    def __init__(self) -> None:
+        self.users = FakeUsers()
+
+
+class CountingHasher(PasswordHasher):
+    __slots__ = ("hashed",)
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.hashed = 0
+
+    async def hash(self, password: str) -> str:
+        self.hashed += 1
+        return await super().hash(password)
+
+
+@pytest.fixture(scope="function")
+def executor():
+    executor = ThreadPoolExecutor(max_workers=1)
+
+    yield executor
+
+    executor.shutdown(wait=True)
+
+
+@pytest.mark.unit
+async def test_register(executor):
+    service = UserService(
+        FakeStorage(), CountingHasher(executor, max_pending=1, rounds=1000)
+    )
+
+    user = await service.register("john@testing.com", "top-secret")
+
+    stored = service.storage.users.users["john@testing.com"]
+    assert stored["key"] == user.key
+    assert stored["is_active"]
+    assert stored["password"].startswith("$pbkdf2-sha512$")
+
+
+@pytest.mark.unit
+async def test_register_existed(executor):
+    service = UserService(
+        FakeStorage(), CountingHasher(executor, max_pending=1, rounds=1000)
+    )
+    user = await service.register("john@testing.com", "top-secret")
+
+    with pytest.raises(EntityAlreadyExist):
+        await service.register("john@testing.com", "other-secret")
+
+    stored = service.storage.users.users["john@testing.com"]
+    assert stored["key"] == user.key
+    assert stored["password"] == user.password
+
+
+@pytest.mark.unit
+async def test_register_overloaded_stores_nothing(executor):
+    service = UserService(FakeStorage(), PasswordHasher(executor, 0))
+
+    with pytest.raises(Overloaded):
+        await service.register("john@testing.com", "top-secret")
+
+    assert service.storage.users.users == {}
+
+
+@pytest.mark.unit
+async def test_last_login_flush():
+    storage = FakeStorage()
+    recorder = LastLoginRecorder(buffer_size=2)
+
+    recorder.record(User(key=1, email="john@testing.com"))  # type: ignore
+    recorder.record(User(key=1, email="john@testing.com"))  # type: ignore
+    recorder.record(User(key=2, email="jane@testing.com"))  # type: ignore
+
+    await recorder.wait(timeout=1)
+
+    assert await recorder.flush(storage) == 2
+    assert sorted(storage.users.logins.keys()) == [1, 2]
+    assert len(recorder) == 0
+
+
+@pytest.mark.unit
+async def test_last_login_flush_failed():
+    storage = FakeStorage()
+    storage.users.failed = True
+    recorder = LastLoginRecorder(buffer_size=10)
+
+    recorder.record(User(key=1, email="john@testing.com"))  # type: ignore
+
+    with pytest.raises(ConnectionError):
+        await recorder.flush(storage)
+
+    assert len(recorder) == 1
+
+
+@pytest.mark.unit
+async def test_reload_inactive_users():
+    storage = FakeStorage()
+    active = User(key=0, email="john@testing.com")  # type: ignore
+    disabled = User(key=0, email="jane@testing.com")  # type: ignore
+    await storage.users.add(active)
+    await storage.users.add(disabled)
+    storage.users.users[disabled.email]["is_active"] = False
+
+    inactive = InactiveUsers()
+    assert not inactive.loaded
+
+    assert await inactive.reload(storage) == 1
+    assert inactive.loaded
+    assert disabled.key in inactive
+    assert active.key not in inactive
@@ -0,0 +1,90 @@
+import time
+from typing import Any, Dict, List
+
+import pytest  # type: ignore
+import sqlalchemy  # type: ignore
+
+from passport.storage.instrumentation import (
+    InstrumentedDatabase,
+    queries_counter,
+    query_name,
+    QueryCounter,
+)
+from passport.storage.users import users
+from passport.timing import stage
+
+
+class FakeConnection:
+    def __init__(self, delay: float) -> None:
+        self.delay = delay
+        self.queries: List[Any] = []
+
+    async def __aenter__(self) -> "FakeConnection":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        pass
+
+    async def fetch_val(
+        self, query: Any, values: Dict = None, column: Any = 0
+    ) -> Any:
+        time.sleep(self.delay)
+        self.queries.append(query)
+        return 1
+
+
+class FakeDatabase:
+    def __init__(self, delay: float = 0) -> None:
+        self.connection_ = FakeConnection(delay)
+        self.url = "postgresql://localhost/passport"
+
+    def connection(self) -> FakeConnection:
+        return self.connection_
+
+
+class FakeLogger:
+    def __init__(self) -> None:
+        self.warnings: List[Dict] = []
+
+    def warning(self, event: str, **kwargs) -> None:
+        self.warnings.append(kwargs)
+
+
+@pytest.mark.unit
+def test_query_name():
+    assert query_name(users.insert()) == "insert.users"
+    assert query_name(sqlalchemy.select([users.c.id])) == "select"
+    assert query_name("\nUPDATE users SET last_login = NULL") == "update"
+
+
+@pytest.mark.unit
+async def test_count_queries():
+    database = InstrumentedDatabase(
+        FakeDatabase(), logger=FakeLogger(), slow_query_threshold=100
+    )
+
+    counter = QueryCounter()
+    token = queries_counter.set(counter)
+    try:
+        await database.fetch_val("SELECT 1")
+        await database.fetch_val("SELECT 2")
+    finally:
+        queries_counter.reset(token)
+
+    assert counter.count == 2
+    assert database.url == "postgresql://localhost/passport"
+
+
+@pytest.mark.unit
+async def test_log_slow_query():
+    logger = FakeLogger()
+    database = InstrumentedDatabase(
+        FakeDatabase(delay=0.02), logger=logger, slow_query_threshold=10
+    )
+
+    with stage("storage.users.exists"):
+        await database.fetch_val("SELECT\n  count(*)\nFROM users")
+
+    [warning] = logger.warnings
+    assert warning["query"] == "storage.users.exists"
+    assert warning["sql"] == "SELECT count(*) FROM users"
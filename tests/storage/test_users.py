@@ -0,0 +1,82 @@
+from datetime import datetime
+
+import pytest  # type: ignore
+
+from passport.domain import User
+from passport.storage import DBStorage
+from passport.storage.users import (
+    permissions as permissions_table,
+    users as users_table,
+)
+
+
+@pytest.fixture(scope="function")
+async def prepared(prepared_app):
+    db = prepared_app["db"]
+
+    for email in ("john@testing.com", "jane@testing.com"):
+        await db.execute(
+            users_table.insert(),
+            values={
+                "email": email,
+                "password": "",
+                "is_active": True,
+                "created_on": datetime.now(),
+            },
+        )
+
+    for name in ("read", "write"):
+        await db.execute(
+            permissions_table.insert(), values={"name": name, "enabled": True}
+        )
+
+    return DBStorage(db)
+
+
+@pytest.mark.integration
+async def test_add_permissions(prepared):
+    granted = await prepared.users.add_permissions(
+        [
+            ("john@testing.com", "read"),
+            ("john@testing.com", "write"),
+            ("jane@testing.com", "read"),
+            ("jane@testing.com", "missing"),
+        ]
+    )
+    assert granted == 3
+
+    again = await prepared.users.add_permissions([("john@testing.com", "read")])
+    assert again == 0
+
+    user = await prepared.users.fetch_by_email("john@testing.com")
+    assert sorted(p.name for p in user.permissions) == ["read", "write"]
+
+
+@pytest.mark.integration
+async def test_remove_permissions(prepared):
+    await prepared.users.add_permissions(
+        [("john@testing.com", "read"), ("john@testing.com", "write")]
+    )
+
+    revoked = await prepared.users.remove_permissions(
+        [("john@testing.com", "write"), ("jane@testing.com", "write")]
+    )
+    assert revoked == 1
+
+    user = await prepared.users.fetch_by_email("john@testing.com")
+    assert [p.name for p in user.permissions] == ["read"]
+
+
+@pytest.mark.integration
+async def test_add_many_skips_existing(prepared):
+    emails = ("john@testing.com", "joe@testing.com", "joe@testing.com")
+
+    imported = await prepared.users.add_many(
+        [
+            User(key=0, email=email, password="")  # type: ignore
+            for email in emails
+        ]
+    )
+
+    assert imported == 1
+    assert await prepared.users.exists("joe@testing.com")
@@ -0,0 +1,40 @@
+import pytest  # type: ignore
+
+from passport.cache import TTLCache
+
+
+@pytest.mark.unit
+def test_cache_hit_and_miss():
+    cache: TTLCache[str] = TTLCache(maxsize=2, ttl=60)
+
+    assert cache.get("foo") is None
+
+    cache.set("foo", "bar")
+    assert cache.get("foo") == "bar"
+
+    assert cache.hits == 1
+    assert cache.misses == 1
+
+
+@pytest.mark.unit
+def test_cache_evicts_least_recently_used():
+    cache: TTLCache[int] = TTLCache(maxsize=2, ttl=60)
+
+    cache.set("first", 1)
+    cache.set("second", 2)
+    cache.get("first")
+    cache.set("third", 3)
+
+    assert len(cache) == 2
+    assert cache.get("second") is None
+    assert cache.get("first") == 1
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("ttl", [0, -10])
+def test_cache_skips_expired_values(ttl):
+    cache: TTLCache[int] = TTLCache(maxsize=2, ttl=60)
+
+    cache.set("foo", 1, ttl=ttl)
+
+    assert cache.get("foo") is None
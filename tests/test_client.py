@@ -0,0 +1,91 @@
+import pytest  # type: ignore
+import structlog  # type: ignore
+from aiohttp import ClientSession, web
+
+from passport.cache import TTLCache
+from passport.client import KeyManager
+from passport.domain import User
+from passport.exceptions import UnknownKey
+from passport.services.keys import KeySet, load_public_key
+from passport.services.tokens import TokenGenerator
+
+
+@pytest.fixture(scope="function")
+async def jwks_server(aiohttp_server, config):
+    key_set = KeySet([load_public_key(config.tokens.public_key)])
+    requests = []
+
+    async def jwks(request: web.Request) -> web.Response:
+        etag = request.headers.get("If-None-Match", None)
+        requests.append(etag)
+
+        if etag == '"jwks"':
+            return web.Response(status=304)
+
+        return web.json_response(key_set.jwks(), headers={"ETag": '"jwks"'})
+
+    app = web.Application()
+    app.router.add_get("/.well-known/jwks.json", jwks)
+
+    server = await aiohttp_server(app)
+    server.requests = requests
+
+    return server
+
+
+@pytest.fixture(scope="function")
+async def manager(jwks_server):
+    async with ClientSession() as session:
+        manager = KeyManager(
+            session,
+            str(jwks_server.make_url("/.well-known/jwks.json")),
+            cache=TTLCache(maxsize=10, ttl=60),
+            refetch_interval=0,
+            logger=structlog.get_logger(),
+        )
+
+        yield manager
+
+        await manager.close()
+
+
+@pytest.mark.unit
+async def test_fetch_keys_conditionally(jwks_server, manager):
+    assert await manager.fetch()
+    assert not await manager.fetch()
+
+    assert jwks_server.requests[0] is None
+    assert jwks_server.requests[1] is not None
+
+
+@pytest.mark.unit
+async def test_decode_token(config, manager):
+    await manager.fetch()
+    generator = TokenGenerator(private_key=config.tokens.private_key)
+
+    user = User(key=1, email="john@testing.com")  # type: ignore
+    token = generator.generate(user)
+
+    assert manager.decode(token).key == 1
+
+
+@pytest.mark.unit
+async def test_unknown_kid_refetch_single_flight(jwks_server, manager):
+    await manager.fetch()
+
+    manager.request_refetch()
+    manager.request_refetch()
+    await manager._refetch
+
+    assert len(jwks_server.requests) == 2
+
+
+@pytest.mark.unit
+async def test_decode_unknown_kid(jwks_server, manager):
+    await manager.fetch()
+
+    with pytest.raises(UnknownKey):
+        manager.decode("eyJhbGciOiJSUzI1NiIsImtpZCI6ImZvbyJ9.e30.c2ln")
+
+    await manager._refetch
+    assert len(jwks_server.requests) == 2
@@ -0,0 +1,74 @@
+import asyncio
+import time
+from types import SimpleNamespace
+from typing import Dict, List, Tuple
+
+import pytest  # type: ignore
+from aiohttp import web
+
+from passport.monitor import blocking_middleware, TimedCoroutine
+
+
+class FakeLogger:
+    def __init__(self) -> None:
+        self.warnings: List[Tuple[str, Dict]] = []
+
+    def warning(self, event: str, **kwargs) -> None:
+        self.warnings.append((event, kwargs))
+
+
+async def blocking(duration: float) -> str:
+    await asyncio.sleep(0)
+    time.sleep(duration)
+    await asyncio.sleep(0)
+
+    return "done"
+
+
+@pytest.mark.unit
+async def test_timed_coroutine():
+    timed = TimedCoroutine(blocking(0.02))
+
+    assert await timed == "done"
+    assert timed.max_step >= 0.02
+
+
+@pytest.mark.unit
+async def test_timed_coroutine_propagates_errors():
+    async def failing():
+        await asyncio.sleep(0)
+        raise ValueError()
+
+    with pytest.raises(ValueError):
+        await TimedCoroutine(failing())
+
+
+@pytest.mark.unit
+async def test_timed_coroutine_cancelled():
+    task = asyncio.ensure_future(TimedCoroutine(asyncio.sleep(10)))
+    await asyncio.sleep(0)
+
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+
+@pytest.mark.unit
+async def test_slow_callback_logged(aiohttp_client):
+    async def handler(request: web.Request) -> web.Response:
+        return web.Response(text=await blocking(0.02))
+
+    app = web.Application(middlewares=[blocking_middleware])
+    app["config"] = SimpleNamespace(
+        monitor=SimpleNamespace(slow_callback_threshold=10)
+    )
+    app["logger"] = FakeLogger()
+    app.router.add_get("/slow", handler, name="slow")
+
+    client = await aiohttp_client(app)
+    resp = await client.get("/slow")
+    assert resp.status == 200
+
+    [(event, details)] = app["logger"].warnings
+    assert event == "Slow callback"
+    assert details["route"] == "slow"
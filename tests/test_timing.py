@@ -0,0 +1,62 @@
+from types import SimpleNamespace
+
+import pytest  # type: ignore
+from aiohttp import web
+
+from passport.timing import server_timing_middleware, stage, timed
+
+
+@timed("tests.fetch")
+async def fetch() -> str:
+    with stage("tests.nested"):
+        return "done"
+
+
+def create_app(enabled: bool) -> web.Application:
+    async def handler(request: web.Request) -> web.Response:
+        return web.Response(text=await fetch())
+
+    async def forbidden(request: web.Request) -> web.Response:
+        with stage("tests.check"):
+            raise web.HTTPForbidden()
+
+    app = web.Application(middlewares=[server_timing_middleware])
+    app["config"] = SimpleNamespace(
+        monitor=SimpleNamespace(server_timing=enabled)
+    )
+    app.router.add_get("/", handler)
+    app.router.add_get("/forbidden", forbidden)
+
+    return app
+
+
+@pytest.mark.unit
+async def test_server_timing_header(aiohttp_client):
+    client = await aiohttp_client(create_app(enabled=True))
+
+    resp = await client.get("/")
+    assert resp.status == 200
+
+    names = [
+        metric.split(";")[0]
+        for metric in resp.headers["Server-Timing"].split(", ")
+    ]
+    assert names == ["tests.nested", "tests.fetch"]
+
+
+@pytest.mark.unit
+async def test_server_timing_header_on_error(aiohttp_client):
+    client = await aiohttp_client(create_app(enabled=True))
+
+    resp = await client.get("/forbidden")
+    assert resp.status == 403
+    assert resp.headers["Server-Timing"].startswith("tests.check;dur=")
+
+
+@pytest.mark.unit
+async def test_server_timing_disabled(aiohttp_client):
+    client = await aiohttp_client(create_app(enabled=False))
+
+    resp = await client.get("/")
+    assert resp.status == 200
+    assert "Server-Timing" not in resp.headers